@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+portfolio-admin: bulk import/export and maintenance for the portfolio database
+
+Run from the backend directory with the same environment as the API
+(MONGO_URL, DB_NAME):
+
+  python admin_cli.py import projects projects.jsonl
+  python admin_cli.py export contact_messages -o messages.jsonl
+  python admin_cli.py reindex
+  python admin_cli.py rebuild-snapshot
+  python admin_cli.py reconcile-counters
+"""
+
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from pymongo import InsertOne, ReplaceOne
+from pymongo.errors import BulkWriteError
+from models import COLLECTION_MODELS
+from database import close_database, ensure_indexes, get_database, verify_indexes
+from snapshot import SECTIONS, rebuild_snapshot
+from revisions import reserve_revisions, stamp_documents
+from coherence import cache_coherence
+import contact_counters
+import asyncio
+import orjson
+import sys
+import time
+import typer
+
+app = typer.Typer(name="portfolio-admin", help="Bulk import/export and maintenance commands", add_completion=False)
+
+IMPORT_MODES = ("upsert", "insert")
+
+
+class Progress:
+    """Throttled progress line on stderr (stdout may carry exported data)"""
+
+    def __init__(self, label: str, total: Optional[int] = None, interval: float = 1.0):
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.count = 0
+        self.started = time.perf_counter()
+        self._last = 0.0
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def advance(self, count: int) -> None:
+        self.count += count
+        now = time.perf_counter()
+        if now - self._last >= self.interval:
+            self._last = now
+            self._print()
+
+    def _print(self) -> None:
+        done = f"{self.count:,}" + (f"/{self.total:,}" if self.total else "")
+        typer.echo(f"\r{self.label}: {done} docs  {self.rate:,.0f} docs/s", err=True, nl=False)
+
+    def finish(self, summary: str) -> None:
+        self._print()
+        elapsed = time.perf_counter() - self.started
+        typer.echo(f"\n{summary} in {elapsed:.1f}s ({self.rate:,.0f} docs/s)", err=True)
+
+
+def _check_collection(collection: str) -> None:
+    if collection not in COLLECTION_MODELS:
+        raise typer.BadParameter(f"must be one of: {', '.join(COLLECTION_MODELS)}", param_hint="COLLECTION")
+
+
+def _read_batches(stream: IO[bytes], batch_size: int) -> Iterator[List[Tuple[int, bytes]]]:
+    """(line number, line) batches; only one batch is held in memory"""
+    batch = []
+    for number, line in enumerate(stream, start=1):
+        if line.strip():
+            batch.append((number, line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _report(message: str) -> None:
+    typer.echo(f"\n{message}", err=True)
+
+
+def _validate(model, batch: List[Tuple[int, bytes]]) -> List[dict]:
+    docs = []
+    for number, line in batch:
+        try:
+            docs.append(model.model_validate(orjson.loads(line)).dict())
+        except orjson.JSONDecodeError as e:
+            _report(f"line {number}: invalid JSON ({str(e)})")
+        except ValidationError as e:
+            problems = "; ".join(f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors())
+            _report(f"line {number}: {problems}")
+    return docs
+
+
+def _operations(docs: List[dict], mode: str) -> list:
+    if mode == "insert":
+        return [InsertOne(doc) for doc in docs]
+    return [ReplaceOne({"id": doc["id"]}, doc, upsert=True) for doc in docs]
+
+
+async def _write(collection, operations: list) -> Tuple[int, int]:
+    """bulk_write one batch; returns (created, updated)"""
+    try:
+        result = await collection.bulk_write(operations, ordered=False)
+        return result.inserted_count + result.upserted_count, result.matched_count
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        for error in write_errors[:10]:
+            _report(f"write error: {error.get('errmsg', 'unknown')}")
+        if len(write_errors) > 10:
+            _report(f"... and {len(write_errors) - 10} more write errors in this batch")
+        return e.details.get("nInserted", 0) + e.details.get("nUpserted", 0), e.details.get("nMatched", 0)
+
+
+async def _write_batch(db, collection: str, docs: List[dict], mode: str) -> Tuple[int, int]:
+    if collection not in SECTIONS:
+        return await _write(db[collection], _operations(docs, mode))
+    # Imported portfolio entries show up in GET /api/portfolio/changes too;
+    # the batch's revisions stay pending until its bulk_write is done
+    async with reserve_revisions(db, len(docs)) as first:
+        stamp_documents(docs, first)
+        return await _write(db[collection], _operations(docs, mode))
+
+
+async def _changed(db, collection: str) -> None:
+    """Bring derived data and running API workers up to date after an import"""
+    if collection == "contact_messages":
+        await contact_counters.reconcile_counters(db)
+    else:
+        await rebuild_snapshot(db)
+    # Running workers refresh their caches and list ETags
+    await cache_coherence.publish(db, collection)
+
+
+async def _import(collection: str, stream: IO[bytes], mode: str, batch_size: int, dry_run: bool) -> int:
+    db = get_database()
+    model = COLLECTION_MODELS[collection]
+    progress = Progress(f"Importing {collection}")
+    created = updated = valid = 0
+    pending: Optional[asyncio.Task] = None
+
+    # Validate the next batch while the previous one is being written
+    for batch in _read_batches(stream, batch_size):
+        docs = _validate(model, batch)
+        valid += len(docs)
+        if pending is not None:
+            batch_created, batch_updated = await pending
+            created, updated = created + batch_created, updated + batch_updated
+            pending = None
+        if docs and not dry_run:
+            pending = asyncio.create_task(_write_batch(db, collection, docs, mode))
+        progress.advance(len(batch))
+    if pending is not None:
+        batch_created, batch_updated = await pending
+        created, updated = created + batch_created, updated + batch_updated
+
+    if (created or updated) and not dry_run:
+        await _changed(db, collection)
+    if dry_run:
+        failed = progress.count - valid
+        progress.finish(f"Validated {collection}: {valid:,} valid, {failed:,} invalid")
+    else:
+        failed = progress.count - created - updated
+        progress.finish(f"Imported {collection}: {created:,} created, {updated:,} updated, {failed:,} failed")
+    return 1 if failed else 0
+
+
+async def _export(collection: str, output: IO[bytes], batch_size: int) -> None:
+    db = get_database()
+    total = await db[collection].estimated_document_count()
+    progress = Progress(f"Exporting {collection}", total)
+    chunk = []
+    async for doc in db[collection].find({}, {"_id": 0}, batch_size=batch_size):
+        chunk.append(orjson.dumps(doc))
+        if len(chunk) >= batch_size:
+            output.write(b"\n".join(chunk) + b"\n")
+            progress.advance(len(chunk))
+            chunk = []
+    if chunk:
+        output.write(b"\n".join(chunk) + b"\n")
+        progress.advance(len(chunk))
+    output.flush()
+    progress.finish(f"Exported {progress.count:,} {collection} documents")
+
+
+def _run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_database()
+    return asyncio.run(main())
+
+
+@app.command("import")
+def import_collection(
+    collection: str = typer.Argument(..., help="Collection to import into"),
+    path: str = typer.Argument(..., help="JSONL file, or - for stdin"),
+    mode: str = typer.Option("upsert", help="upsert: replace documents by id; insert: insert only"),
+    batch_size: int = typer.Option(1000, min=1, help="Documents per bulk write"),
+    dry_run: bool = typer.Option(False, help="Validate without writing"),
+):
+    """Import documents from JSON Lines, validated against the collection's model"""
+    _check_collection(collection)
+    if mode not in IMPORT_MODES:
+        raise typer.BadParameter(f"must be one of: {', '.join(IMPORT_MODES)}", param_hint="--mode")
+    if path == "-":
+        code = _run(_import(collection, sys.stdin.buffer, mode, batch_size, dry_run))
+    else:
+        with open(Path(path), "rb") as stream:
+            code = _run(_import(collection, stream, mode, batch_size, dry_run))
+    raise typer.Exit(code)
+
+
+@app.command("export")
+def export_collection(
+    collection: str = typer.Argument(..., help="Collection to export"),
+    output: str = typer.Option("-", "--output", "-o", help="JSONL file, or - for stdout"),
+    batch_size: int = typer.Option(1000, min=1, help="Documents per cursor batch"),
+):
+    """Export a collection as JSON Lines"""
+    _check_collection(collection)
+    if output == "-":
+        _run(_export(collection, sys.stdout.buffer, batch_size))
+    else:
+        with open(Path(output), "wb") as stream:
+            _run(_export(collection, stream, batch_size))
+
+
+@app.command()
+def reindex():
+    """Create the registered indexes and report missing, mismatched or redundant ones"""
+    async def run():
+        await ensure_indexes()
+        return await verify_indexes()
+
+    report = _run(run())
+    for problem, names in report.items():
+        typer.echo(f"{problem}: {', '.join(names) if names else '-'}")
+
+
+@app.command("rebuild-snapshot")
+def rebuild_snapshot_command():
+    """Rebuild the materialized portfolio snapshot from the source collections"""
+    async def run():
+        db = get_database()
+        snapshot = await rebuild_snapshot(db)
+        for section in SECTIONS:
+            await cache_coherence.publish(db, section)
+        return snapshot
+
+    snapshot = _run(run())
+    typer.echo(f"Snapshot rebuilt at {snapshot['updated_at'].isoformat()}")
+
+
+@app.command("reconcile-counters")
+def reconcile_counters_command():
+    """Recount contact messages by status"""
+    counters = _run(contact_counters.reconcile_counters(get_database()))
+    typer.echo(", ".join(f"{status}: {count}" for status, count in counters.items()))
+
+
+if __name__ == "__main__":
+    app()
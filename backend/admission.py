@@ -0,0 +1,179 @@
+from collections import OrderedDict
+from fastapi import HTTPException, Request
+from typing import Awaitable, Callable, List, Optional, Union
+import asyncio
+import math
+import os
+import time
+
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', '10000'))
+# Only trust X-Forwarded-For when the API sits behind a proxy that sets it
+TRUST_PROXY_HEADERS = os.environ.get('TRUST_PROXY_HEADERS', 'false').lower() == 'true'
+
+CONTACT_RATE_PER_IP = float(os.environ.get('CONTACT_RATE_PER_IP', '5'))  # per minute
+CONTACT_BURST_PER_IP = float(os.environ.get('CONTACT_BURST_PER_IP', '5'))
+CONTACT_RATE_PER_EMAIL = float(os.environ.get('CONTACT_RATE_PER_EMAIL', '3'))  # per minute
+CONTACT_BURST_PER_EMAIL = float(os.environ.get('CONTACT_BURST_PER_EMAIL', '3'))
+
+WRITE_CONCURRENCY_LIMIT = int(os.environ.get('WRITE_CONCURRENCY_LIMIT', '32'))
+WRITE_QUEUE_TIMEOUT_MS = int(os.environ.get('WRITE_QUEUE_TIMEOUT_MS', '100'))
+WRITE_RETRY_AFTER = int(os.environ.get('WRITE_RETRY_AFTER', '1'))
+
+KeyFunc = Callable[[Request], Union[Optional[str], Awaitable[Optional[str]]]]
+
+
+class RateLimiter:
+    """Token bucket per key: ``burst`` requests at once, refilled at ``rate``
+    per minute
+
+    Each key costs one small entry; the least recently seen keys are evicted
+    beyond ``max_keys``. An evicted key simply starts again with a full bucket.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.name = name
+        self.rate = rate / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+        self.evicted = 0
+
+    def hit(self, key: str) -> float:
+        """Take a token for ``key``; 0 if allowed, else seconds until one is free"""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            self.allowed += 1
+            return 0.0
+        self.limited += 1
+        return (1 - bucket[0]) / self.rate if self.rate > 0 else 60.0
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evicted": self.evicted,
+        }
+
+
+class ConcurrencyLimiter:
+    """Caps how many write handlers run at once; sheds the rest with 503"""
+
+    def __init__(self, limit: int, queue_timeout: float, retry_after: int):
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+
+    async def acquire(self) -> bool:
+        """Wait up to ``queue_timeout`` for a slot"""
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            return False
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """Client address, from X-Forwarded-For when TRUST_PROXY_HEADERS is set"""
+    if TRUST_PROXY_HEADERS:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+def body_field(field: str) -> KeyFunc:
+    """Key function reading ``field`` from the JSON body (normalized to lowercase)"""
+    async def key(request: Request) -> Optional[str]:
+        try:
+            body = await request.json()
+        except ValueError:
+            return None
+        value = body.get(field) if isinstance(body, dict) else None
+        return value.strip().lower() if isinstance(value, str) else None
+    return key
+
+
+def rate_limit(limiter: RateLimiter, key_func: KeyFunc):
+    """Dependency answering 429 with Retry-After once ``limiter`` runs dry"""
+    async def dependency(request: Request) -> None:
+        if not RATE_LIMIT_ENABLED:
+            return
+        key = key_func(request)
+        if asyncio.iscoroutine(key):
+            key = await key
+        if key is None:
+            return
+        wait = limiter.hit(key)
+        if wait > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(math.ceil(wait))}
+            )
+    return dependency
+
+
+def concurrency_limit(limiter: ConcurrencyLimiter):
+    """Dependency holding a ``limiter`` slot for the rest of the request"""
+    async def dependency():
+        if not await limiter.acquire():
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": str(limiter.retry_after)}
+            )
+        try:
+            yield
+        finally:
+            limiter.release()
+    return dependency
+
+
+contact_ip_limiter = RateLimiter("contact_ip", CONTACT_RATE_PER_IP, CONTACT_BURST_PER_IP)
+contact_email_limiter = RateLimiter("contact_email", CONTACT_RATE_PER_EMAIL, CONTACT_BURST_PER_EMAIL)
+write_limiter = ConcurrencyLimiter(WRITE_CONCURRENCY_LIMIT, WRITE_QUEUE_TIMEOUT_MS / 1000, WRITE_RETRY_AFTER)
+# The one global write cap; every write endpoint depends on it
+limit_writes = concurrency_limit(write_limiter)
+
+
+def stats() -> dict:
+    return {
+        "contact_ip": contact_ip_limiter.stats(),
+        "contact_email": contact_email_limiter.stats(),
+        "writes": write_limiter.stats(),
+    }
@@ -0,0 +1,87 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional
+from snapshot import SECTIONS
+
+
+class PortfolioCache:
+    """In-process cache for the assembled portfolio snapshot.
+
+    Writers call ``invalidate()`` after committing; the TTL is only a safety
+    net for writes that bypass the API (manual edits, other services).
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._value: Optional[Any] = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired"""
+        if self._value is not None and time.monotonic() < self._expires_at:
+            self.hits += 1
+            return self._value
+        self.misses += 1
+        return None
+
+    def set(self, value: Any, generation: Optional[int] = None) -> None:
+        """Store a value unless an invalidation happened since ``generation``"""
+        if generation is not None and generation != self._generation:
+            return
+        self._value = value
+        self._expires_at = time.monotonic() + self.ttl_seconds
+
+    def invalidate(self) -> None:
+        """Drop the cached value; called by every portfolio writer"""
+        self._generation += 1
+        self._value = None
+        self._expires_at = 0.0
+        self.invalidations += 1
+
+    async def get_or_load(self, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value, loading it once for concurrent misses"""
+        value = self.get()
+        if value is not None:
+            return value
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            # Another request may have filled the cache while we waited
+            if self._value is not None and time.monotonic() < self._expires_at:
+                return self._value
+
+            generation = self._generation
+            value = await loader()
+            self.set(value, generation)
+            return value
+
+    def stats(self) -> dict:
+        """Get hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self.ttl_seconds,
+            "cached": self._value is not None and time.monotonic() < self._expires_at,
+        }
+
+
+portfolio_cache = PortfolioCache(
+    ttl_seconds=float(os.environ.get('PORTFOLIO_CACHE_TTL', '300'))
+)
+
+# One cache per portfolio section, for GET /api/portfolio?sections=...
+section_caches = {
+    section: PortfolioCache(ttl_seconds=portfolio_cache.ttl_seconds)
+    for section in SECTIONS
+}
@@ -0,0 +1,168 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Union
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure, PyMongoError
+import asyncio
+import inspect
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_ID = "portfolio"
+
+# "auto" uses a change stream when the server is a replica set, else polls
+COHERENCE_MODES = ("auto", "poll", "off")
+
+Listener = Callable[[str], Union[None, Awaitable[None]]]
+
+
+class CacheCoherence:
+    """Keeps in-process caches on every worker in step with portfolio writes
+
+    Writers bump a per-section counter in the ``cache_versions`` collection.
+    Every worker watches that document (change stream or short poll) and
+    runs the listeners registered for the sections whose version moved.
+    """
+
+    def __init__(self, mode: str = "auto", poll_interval: float = 1.0):
+        if mode not in COHERENCE_MODES:
+            raise ValueError(f"Invalid cache coherence mode: {mode}")
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.transport: Optional[str] = None
+        self._db = None
+        self._known: Dict[str, int] = {}
+        self._listeners: Dict[str, List[Listener]] = defaultdict(list)
+        self._task: Optional[asyncio.Task] = None
+        self.remote_changes = 0
+
+    @classmethod
+    def from_env(cls) -> "CacheCoherence":
+        return cls(
+            mode=os.environ.get('CACHE_COHERENCE_MODE', 'auto'),
+            poll_interval=float(os.environ.get('CACHE_COHERENCE_POLL_INTERVAL', '1.0'))
+        )
+
+    def subscribe(self, sections: Iterable[str], listener: Listener) -> None:
+        """Run ``listener(section)`` when another worker changes a section"""
+        for section in sections:
+            self._listeners[section].append(listener)
+
+    async def publish(self, db, section: str) -> None:
+        """Record a committed write to ``section`` for the other workers"""
+        previous = self._known.get(section, 0)
+        doc = await db.cache_versions.find_one_and_update(
+            {"_id": VERSIONS_ID},
+            {"$inc": {section: 1}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if doc[section] == previous + 1:
+            # Only our own write since we last looked; already refreshed here
+            self._known[section] = max(self._known.get(section, 0), doc[section])
+        else:
+            # Another worker wrote in between; pick its change up now
+            await self._apply(doc)
+
+    async def start(self, db) -> None:
+        """Load the current versions and begin watching for changes"""
+        if self.mode == "off" or self._task is not None:
+            return
+        self._db = db
+        doc = await db.cache_versions.find_one({"_id": VERSIONS_ID}) or {}
+        self._known = _versions(doc)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                # Never let a dead watcher abort the rest of shutdown
+                logger.error(f"Cache coherence task failed: {str(e)}")
+            self._task = None
+            self.transport = None
+
+    async def _run(self) -> None:
+        """Watch (or poll) until cancelled, reconnecting after any error"""
+        watch = self.mode == "auto"
+        while True:
+            try:
+                if watch:
+                    await self._watch()
+                    logger.warning("Cache coherence change stream closed; reopening")
+                else:
+                    await self._poll()
+            except OperationFailure as e:
+                if watch and self.transport != "change_stream":
+                    # Change streams need a replica set or sharded cluster
+                    logger.info(f"Cache coherence falling back to polling: {str(e)}")
+                    watch = False
+                    continue
+                logger.error(f"Cache coherence {self.transport or 'watch'} failed, retrying: {str(e)}")
+            except PyMongoError as e:
+                # Network errors and failovers; the reopened stream catches up
+                logger.error(f"Cache coherence {self.transport or 'watch'} failed, retrying: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _watch(self) -> None:
+        pipeline = [{"$match": {"documentKey._id": VERSIONS_ID}}]
+        async with self._db.cache_versions.watch(pipeline, full_document="updateLookup") as stream:
+            self.transport = "change_stream"
+            logger.info("Cache coherence watching cache_versions change stream")
+            # Catch up on anything written before the stream opened
+            await self.check()
+            async for change in stream:
+                await self._apply(change.get("fullDocument") or {})
+
+    async def _poll(self) -> None:
+        self.transport = "poll"
+        logger.info(f"Cache coherence polling cache_versions every {self.poll_interval}s")
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.check()
+            except PyMongoError as e:
+                logger.error(f"Error polling cache versions: {str(e)}")
+
+    async def check(self) -> List[str]:
+        """Read the versions once and handle any sections that moved"""
+        doc = await self._db.cache_versions.find_one({"_id": VERSIONS_ID}) or {}
+        return await self._apply(doc)
+
+    async def _apply(self, doc: dict) -> List[str]:
+        changed = [
+            section for section, version in _versions(doc).items()
+            if version > self._known.get(section, 0)
+        ]
+        for section in changed:
+            self._known[section] = doc[section]
+            self.remote_changes += 1
+            for listener in self._listeners.get(section, []):
+                try:
+                    result = listener(section)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"Error refreshing cache for {section}: {str(e)}")
+        return changed
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "transport": self.transport or "stopped",
+            "remote_changes": self.remote_changes,
+            "versions": dict(self._known),
+        }
+
+
+def _versions(doc: dict) -> Dict[str, int]:
+    return {key: value for key, value in doc.items() if isinstance(value, int) and key != "_id"}
+
+
+cache_coherence = CacheCoherence.from_env()
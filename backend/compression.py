@@ -0,0 +1,214 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from http_cache import ENCODINGS, base_etag, compress_body, etag_matches, negotiate_encoding, variant_etag
+import os
+
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+# Bodies smaller than this are sent as is; the framing overhead eats the gain
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6'))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '5'))
+COMPRESSION_CACHE_ENTRIES = int(os.environ.get('COMPRESSION_CACHE_ENTRIES', '256'))
+COMPRESSION_CACHE_MAX_BYTES = int(os.environ.get('COMPRESSION_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+COMPRESSION_LEVELS = {"gzip": COMPRESSION_GZIP_LEVEL, "br": COMPRESSION_BROTLI_QUALITY}
+
+
+class CompressedBodyCache:
+    """LRU of compressed response bodies keyed by (ETag, encoding)
+
+    A strong ETag identifies the exact body, so a repeat response is sent
+    from here instead of being compressed again.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        # Whether the 200 for (ETag, encoding) went out compressed, for 304s
+        self._decisions: "OrderedDict[Tuple[str, str], bool]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def compress(self, body: bytes, encoding: str, etag: Optional[str] = None) -> bytes:
+        """Compressed ``body``, from the cache when ``etag`` was seen before"""
+        key = (etag, encoding)
+        if etag is not None and key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            compressed = self._entries[key]
+        else:
+            self.misses += 1
+            compressed = compress_body(body, encoding, COMPRESSION_LEVELS)
+            if etag is not None:
+                self._store(key, compressed)
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        return compressed
+
+    def remember(self, etag: str, encoding: str, compressed: bool) -> None:
+        """Record whether the 200 for ``etag`` was sent with ``encoding``"""
+        key = (etag, encoding)
+        self._decisions[key] = compressed
+        self._decisions.move_to_end(key)
+        while len(self._decisions) > max(self.max_entries, 1) * 4:
+            self._decisions.popitem(last=False)
+
+    def was_compressed(self, etag: str, encoding: str) -> Optional[bool]:
+        """What ``remember`` recorded, or None if this worker never sent it"""
+        return self._decisions.get((etag, encoding))
+
+    def _store(self, key: Tuple[str, str], compressed: bytes) -> None:
+        if self.max_entries <= 0 or len(compressed) > self.max_bytes:
+            return
+        self._entries[key] = compressed
+        self._bytes += len(compressed)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+
+compressed_body_cache = CompressedBodyCache(COMPRESSION_CACHE_ENTRIES, COMPRESSION_CACHE_MAX_BYTES)
+
+
+def _add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _strip_variant_etags(scope) -> dict:
+    """Rewrite If-None-Match so handlers see the identity ETags they issued"""
+    headers = []
+    for name, value in scope["headers"]:
+        if name == b"if-none-match":
+            etags = [base_etag(etag.strip()) for etag in value.decode("latin-1").split(",")]
+            value = ", ".join(etags).encode("latin-1")
+        headers.append((name, value))
+    return {**scope, "headers": headers}
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing single-body responses with br or gzip
+
+    Compressed representations get their own ETag (see ``variant_etag``), and
+    a conditional request for one is answered by the handler's usual 304
+    logic. Streaming responses and bodies that are already encoded (e.g. the
+    pre-rendered portfolio files) pass through untouched.
+    """
+
+    def __init__(self, app, cache: Optional[CompressedBodyCache] = None,
+                 minimum_size: int = COMPRESSION_MIN_SIZE, enabled: bool = COMPRESSION_ENABLED):
+        self.app = app
+        self.cache = cache or compressed_body_cache
+        self.minimum_size = minimum_size
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"), ENCODINGS)
+        if_none_match = request_headers.get("if-none-match")
+        if "if-none-match" in request_headers:
+            scope = _strip_variant_etags(scope)
+
+        start: Optional[dict] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if message["status"] == 304:
+                    # Name the representation the 200 would have carried
+                    _add_vary(headers)
+                    if "etag" in headers and encoding != "identity":
+                        etag = base_etag(headers["etag"])
+                        if self._sends_variant(etag, encoding, if_none_match):
+                            headers["ETag"] = variant_etag(etag, encoding)
+                    passthrough = True
+                    await send(message)
+                elif not _compressible(headers):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            if passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if start is not None and message.get("more_body", False):
+                # Streaming response: send it as it comes
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            start, body = self._encode(start, body, encoding)
+            await send(start)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _sends_variant(self, etag: str, encoding: str, if_none_match: Optional[str]) -> bool:
+        """Whether the 200 for ``etag`` goes out compressed with ``encoding``"""
+        compressed = self.cache.was_compressed(etag, encoding)
+        if compressed is None:
+            # Sent by another worker: the client holds whichever one it got
+            compressed = etag_matches(if_none_match, variant_etag(etag, encoding))
+        return compressed
+
+    def _encode(self, start: dict, body: bytes, encoding: str) -> Tuple[dict, bytes]:
+        headers = MutableHeaders(scope=start)
+        _add_vary(headers)
+        if encoding == "identity" or start["status"] != 200:
+            return start, body
+
+        etag = headers.get("etag")
+        if len(body) < self.minimum_size:
+            if etag:
+                self.cache.remember(etag, encoding, False)
+            return start, body
+
+        compressed = self.cache.compress(body, encoding, etag)
+        if etag:
+            self.cache.remember(etag, encoding, len(compressed) < len(body))
+        if len(compressed) >= len(body):
+            return start, body
+
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(compressed))
+        if etag:
+            headers["ETag"] = variant_etag(etag, encoding)
+        return start, compressed
\ No newline at end of file
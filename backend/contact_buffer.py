@@ -0,0 +1,188 @@
+from pymongo.errors import BulkWriteError
+from collections import Counter
+from typing import List, Optional, Tuple
+import contact_counters
+import contact_jobs
+from list_versions import collection_changed
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# "flush": the request waits until its message is written (no loss on crash)
+# "enqueue": the request returns as soon as the message is queued
+DURABILITY_MODES = ("flush", "enqueue")
+
+_STOP = object()
+
+
+class ContactWriteBuffer:
+    """Write-behind buffer batching contact messages into insert_many calls"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        durability: str = "flush",
+        max_batch: int = 100,
+        max_delay: float = 0.05,
+        max_queue: int = 10000
+    ):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Invalid contact buffer durability: {durability}")
+        self.enabled = enabled
+        self.durability = durability
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self._db = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.enqueued = 0
+        self.flushed = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ContactWriteBuffer":
+        return cls(
+            enabled=os.environ.get('CONTACT_WRITE_MODE', 'direct') == 'buffered',
+            durability=os.environ.get('CONTACT_BUFFER_DURABILITY', 'flush'),
+            max_batch=int(os.environ.get('CONTACT_BUFFER_MAX_BATCH', '100')),
+            max_delay=float(os.environ.get('CONTACT_BUFFER_MAX_DELAY_MS', '50')) / 1000,
+            max_queue=int(os.environ.get('CONTACT_BUFFER_MAX_QUEUE', '10000'))
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, db) -> None:
+        """Start the background flusher"""
+        if not self.enabled or self.running:
+            return
+        self._db = db
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Contact write buffer started (durability={self.durability}, "
+            f"batch={self.max_batch}, delay={self.max_delay * 1000:.0f}ms)"
+        )
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything still queued, then stop the flusher"""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Contact write buffer did not drain within {timeout}s "
+                         f"({self._queue.qsize()} messages left)")
+            self._task.cancel()
+        self._task = None
+
+    async def submit(self, message_dict: dict) -> None:
+        """Queue a validated message; waits for the write in "flush" mode"""
+        future = None
+        if self.durability == "flush":
+            future = asyncio.get_running_loop().create_future()
+
+        await self._queue.put((message_dict, future))
+        self.enqueued += 1
+
+        if future is not None:
+            await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[Tuple[dict, Optional[asyncio.Future]]]) -> None:
+        docs = [doc for doc, _ in batch]
+        errors = {}
+
+        started = time.perf_counter()
+        try:
+            await self._db.contact_messages.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                errors[error["index"]] = error.get("errmsg", "write error")
+        except Exception as e:
+            errors = {index: str(e) for index in range(len(batch))}
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.batches += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self.total_flush_ms += elapsed_ms
+        self.flushed += len(batch) - len(errors)
+        self.failed += len(errors)
+
+        inserted = Counter(
+            doc.get("status", "new") for index, doc in enumerate(docs) if index not in errors
+        )
+        for status, count in inserted.items():
+            try:
+                await contact_counters.increment(self._db, status, count)
+            except Exception as e:
+                logger.error(f"Error updating contact counters: {str(e)}")
+        if inserted:
+            await collection_changed(self._db, "contact_messages")
+            await contact_jobs.enqueue_processing(self._db, [doc for index, doc in enumerate(docs) if index not in errors])
+
+        for index, (doc, future) in enumerate(batch):
+            if index in errors:
+                if future is None:
+                    logger.error(f"Dropped buffered contact message {doc.get('id')}: {errors[index]}")
+                elif not future.done():
+                    future.set_exception(RuntimeError(errors[index]))
+            elif future is not None and not future.done():
+                future.set_result(None)
+
+    def stats(self) -> dict:
+        """Get queue depth and flush latency metrics"""
+        return {
+            "enabled": self.enabled,
+            "durability": self.durability,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_batch_size": round((self.flushed + self.failed) / self.batches, 2) if self.batches else 0.0,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "avg_flush_ms": round(self.total_flush_ms / self.batches, 3) if self.batches else 0.0,
+        }
+
+
+contact_write_buffer = ContactWriteBuffer.from_env()
@@ -0,0 +1,94 @@
+from typing import Optional
+from pymongo.errors import DuplicateKeyError
+from models import MESSAGE_STATUSES
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_ID = "contact_messages"
+
+# How often the background job rebuilds the counters from scratch (0 disables)
+RECONCILE_INTERVAL = float(os.environ.get('CONTACT_COUNTERS_RECONCILE_INTERVAL', '3600'))
+# A reconcile that keeps losing the race against writers gives up after this
+RECONCILE_ATTEMPTS = 5
+
+
+async def increment(db, status: str, amount: int = 1) -> None:
+    """Count a message entering (or, with a negative amount, leaving) a status"""
+    result = await db.contact_counters.update_one(
+        {"_id": COUNTERS_ID},
+        {"$inc": {"total": amount, status: amount, "version": 1}}
+    )
+    if result.matched_count == 0:
+        # No counters yet (new or wiped): build them from the messages,
+        # which already include this one
+        await reconcile_counters(db)
+
+
+async def transition(db, old_status: str, new_status: str) -> None:
+    """Move one message between status counters"""
+    if old_status == new_status:
+        return
+    result = await db.contact_counters.update_one(
+        {"_id": COUNTERS_ID},
+        {"$inc": {old_status: -1, new_status: 1, "version": 1}}
+    )
+    if result.matched_count == 0:
+        await reconcile_counters(db)
+
+
+async def reconcile_counters(db) -> dict:
+    """Rebuild the counters with a single $group over contact_messages
+
+    Every $inc bumps ``version``, and the result is only written if the
+    version did not move during the $group; otherwise it is recomputed.
+    One window remains: a message inserted before the $group whose $inc
+    lands after the write is counted twice, until the next reconcile.
+    """
+    for _ in range(RECONCILE_ATTEMPTS):
+        current = await db.contact_counters.find_one({"_id": COUNTERS_ID}, {"version": 1})
+        counters = {"total": 0, **{status: 0 for status in MESSAGE_STATUSES}}
+
+        pipeline = [{"$group": {"_id": "$status", "count": {"$sum": 1}}}]
+        async for row in db.contact_messages.aggregate(pipeline):
+            counters["total"] += row["count"]
+            if row["_id"] in counters:
+                counters[row["_id"]] = row["count"]
+
+        try:
+            if current is None:
+                await db.contact_counters.insert_one({"_id": COUNTERS_ID, **counters, "version": 0})
+                return counters
+            version = current.get("version", 0)
+            result = await db.contact_counters.replace_one(
+                {"_id": COUNTERS_ID, "version": current.get("version")},
+                {**counters, "version": version + 1}
+            )
+            if result.matched_count:
+                return counters
+        except DuplicateKeyError:
+            pass  # another reconcile created the document first
+    logger.warning(f"Contact counters changed during {RECONCILE_ATTEMPTS} reconcile attempts; left as they were")
+    return counters
+
+
+async def get_counters(db) -> dict:
+    """Read the counters document, building it on first use"""
+    counters = await db.contact_counters.find_one({"_id": COUNTERS_ID}, {"_id": 0, "version": 0})
+    if counters is None:
+        counters = await reconcile_counters(db)
+    return counters
+
+
+async def run_reconciler(db, interval: Optional[float] = None) -> None:
+    """Periodically correct any drift between the counters and the messages"""
+    interval = RECONCILE_INTERVAL if interval is None else interval
+    while True:
+        try:
+            counters = await reconcile_counters(db)
+            logger.info(f"Contact counters reconciled: {counters}")
+        except Exception as e:
+            logger.error(f"Error reconciling contact counters: {str(e)}")
+        await asyncio.sleep(interval)
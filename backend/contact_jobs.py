@@ -0,0 +1,152 @@
+from email.message import EmailMessage
+from typing import Callable, Dict, List
+from pymongo import UpdateOne
+from jobs import JOBS_ENABLED, Retry, job_queue
+from list_versions import collection_changed
+import asyncio
+import logging
+import os
+import re
+import smtplib
+
+logger = logging.getLogger(__name__)
+
+# Any SMTP server works, e.g. a local debugging one:
+#   python -m aiosmtpd -n -l localhost:1025  (NOTIFY_SMTP_HOST=localhost NOTIFY_SMTP_PORT=1025)
+NOTIFY_SMTP_HOST = os.environ.get('NOTIFY_SMTP_HOST', '')
+NOTIFY_SMTP_PORT = int(os.environ.get('NOTIFY_SMTP_PORT', '25'))
+NOTIFY_SMTP_USER = os.environ.get('NOTIFY_SMTP_USER', '')
+NOTIFY_SMTP_PASSWORD = os.environ.get('NOTIFY_SMTP_PASSWORD', '')
+NOTIFY_SMTP_STARTTLS = os.environ.get('NOTIFY_SMTP_STARTTLS', 'false').lower() == 'true'
+NOTIFY_SMTP_TIMEOUT = float(os.environ.get('NOTIFY_SMTP_TIMEOUT', '10'))
+NOTIFY_FROM = os.environ.get('NOTIFY_FROM', 'portfolio@localhost')
+NOTIFY_TO = [address.strip() for address in os.environ.get('NOTIFY_TO', '').split(",") if address.strip()]
+NOTIFY_BATCH_SIZE = int(os.environ.get('NOTIFY_BATCH_SIZE', '20'))
+
+SPAM_THRESHOLD = float(os.environ.get('CONTACT_SPAM_THRESHOLD', '0.6'))
+# Jobs for a message that is not there (deleted, or dropped by the write
+# buffer) give up after this many attempts instead of JOB_MAX_ATTEMPTS
+MISSING_MESSAGE_ATTEMPTS = int(os.environ.get('CONTACT_JOB_MISSING_ATTEMPTS', '3'))
+
+_LINK_RE = re.compile(r"https?://|www\.", re.IGNORECASE)
+_SPAM_WORDS = re.compile(
+    r"\b(casino|crypto|bitcoin|forex|viagra|loan|seo services|backlinks|guest post|"
+    r"click here|buy now|free money|winner|100% free)\b",
+    re.IGNORECASE
+)
+TAG_KEYWORDS = {
+    "job": ("hiring", "position", "role", "opportunity", "recruit", "internship", "interview", "job"),
+    "freelance": ("freelance", "contract", "quote", "budget", "website for", "app for"),
+    "collaboration": ("collaborate", "collaboration", "partner", "open source", "team up"),
+    "feedback": ("feedback", "suggestion", "loved your", "great portfolio"),
+}
+
+NOTIFICATION_FIELDS = ("id", "name", "email", "subject", "message")
+
+
+def spam_score(message: dict) -> float:
+    """Cheap 0..1 heuristic: links, known spam phrases, shouting"""
+    text = f"{message.get('subject', '')} {message.get('message', '')}"
+    score = 0.0
+    links = len(_LINK_RE.findall(text))
+    score += min(0.5, 0.2 * links)
+    score += min(0.6, 0.3 * len(_SPAM_WORDS.findall(text)))
+    letters = [char for char in text if char.isalpha()]
+    if len(letters) >= 20 and sum(char.isupper() for char in letters) / len(letters) > 0.6:
+        score += 0.2
+    if len(message.get("message", "").strip()) < 5:
+        score += 0.2
+    return round(min(score, 1.0), 2)
+
+
+def auto_tags(message: dict) -> List[str]:
+    text = f"{message.get('subject', '')} {message.get('message', '')}".lower()
+    tags = [tag for tag, keywords in TAG_KEYWORDS.items() if any(keyword in text for keyword in keywords)]
+    if "?" in text:
+        tags.append("question")
+    return tags
+
+
+def jobs_for(message: dict) -> List[tuple]:
+    """Post-submission jobs for a new contact message"""
+    payload = {field: message[field] for field in NOTIFICATION_FIELDS}
+    return [("contact.spam_check", payload), ("contact.auto_tag", payload)]
+
+
+async def enqueue_processing(db, messages: List[dict]) -> None:
+    """Queue the post-submission jobs for saved messages in one insert
+
+    Errors are logged, not raised: the messages are already stored.
+    """
+    if not JOBS_ENABLED or not messages:
+        return
+    try:
+        await job_queue.enqueue(db, [job for message in messages for job in jobs_for(message)])
+    except Exception as e:
+        logger.error(f"Error queueing jobs for {len(messages)} contact messages: {str(e)}")
+
+
+async def _update_messages(db, payloads: List[dict], update: Callable[[dict], dict]) -> Dict[int, Retry]:
+    """Apply ``update(payload)`` to each payload's message; the ones not
+    found are returned for a (capped) retry, the rest of the batch is done"""
+    found = set(await db.contact_messages.distinct("id", {"id": {"$in": [payload["id"] for payload in payloads]}}))
+    updates = [UpdateOne({"id": payload["id"]}, update(payload)) for payload in payloads if payload["id"] in found]
+    if updates:
+        result = await db.contact_messages.bulk_write(updates, ordered=False)
+        if result.modified_count:
+            await collection_changed(db, "contact_messages")
+    return {
+        index: Retry(f"contact message {payload['id']} not found", MISSING_MESSAGE_ATTEMPTS)
+        for index, payload in enumerate(payloads) if payload["id"] not in found
+    }
+
+
+@job_queue.register("contact.spam_check", batch_size=20)
+async def check_spam(db, payloads: List[dict]) -> Dict[int, Retry]:
+    scores = [spam_score(payload) for payload in payloads]
+    by_id = {payload["id"]: score for payload, score in zip(payloads, scores)}
+    missing = await _update_messages(db, payloads, lambda payload: {
+        "$set": {"spam_score": by_id[payload["id"]], "spam": by_id[payload["id"]] >= SPAM_THRESHOLD}
+    })
+    await job_queue.enqueue(db, [
+        ("contact.notify", payload) for index, payload in enumerate(payloads)
+        if index not in missing and scores[index] < SPAM_THRESHOLD
+    ])
+    return missing
+
+
+@job_queue.register("contact.auto_tag", batch_size=20)
+async def tag_messages(db, payloads: List[dict]) -> Dict[int, Retry]:
+    return await _update_messages(db, payloads, lambda payload: {
+        "$addToSet": {"tags": {"$each": auto_tags(payload)}}
+    })
+
+
+def _send_emails(emails: List[EmailMessage]) -> None:
+    """Deliver ``emails`` over a single SMTP session"""
+    with smtplib.SMTP(NOTIFY_SMTP_HOST, NOTIFY_SMTP_PORT, timeout=NOTIFY_SMTP_TIMEOUT) as smtp:
+        if NOTIFY_SMTP_STARTTLS:
+            smtp.starttls()
+        if NOTIFY_SMTP_USER:
+            smtp.login(NOTIFY_SMTP_USER, NOTIFY_SMTP_PASSWORD)
+        for email in emails:
+            smtp.send_message(email)
+
+
+def _notification(payload: dict) -> EmailMessage:
+    email = EmailMessage()
+    email["From"] = NOTIFY_FROM
+    email["To"] = ", ".join(NOTIFY_TO)
+    email["Reply-To"] = payload["email"]
+    email["Subject"] = f"[Portfolio] {payload['subject']}"
+    email.set_content(f"From: {payload['name']} <{payload['email']}>\n\n{payload['message']}\n")
+    return email
+
+
+@job_queue.register("contact.notify", batch_size=NOTIFY_BATCH_SIZE)
+async def notify(db, payloads: List[dict]) -> None:
+    if not NOTIFY_SMTP_HOST or not NOTIFY_TO:
+        logger.info(f"Contact notifications not configured; skipping {len(payloads)}")
+        return
+    await asyncio.to_thread(_send_emails, [_notification(payload) for payload in payloads])
+    logger.info(f"Sent {len(payloads)} contact notifications")
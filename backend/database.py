@@ -1,32 +1,233 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-import os
+from bson.son import SON
+from pymongo import monitoring
+from pymongo.errors import OperationFailure
+from pathlib import Path
 from dotenv import load_dotenv
+from models import INDEXES as MODEL_INDEXES, IndexSpec
+from metrics import command_listener
+import asyncio
+import os
+import threading
+import time
+
+load_dotenv(Path(__file__).parent / '.env')
+
+# TTL indexes with a configurable expiry: raw status checks and finished
+# jobs. Read here rather than in models.py so values in .env apply.
+INDEXES = MODEL_INDEXES + [
+    IndexSpec(collection="status_checks", keys=[("timestamp", -1)],
+              expire_after_seconds=int(os.environ.get('STATUS_CHECK_TTL_SECONDS', '604800'))),
+    IndexSpec(collection="jobs", keys=[("finished_at", 1)],
+              expire_after_seconds=int(os.environ.get('JOBS_RETENTION_SECONDS', '604800'))),
+]
+
+# MongoDB's code when an index exists with the same keys but other options
+INDEX_OPTIONS_CONFLICT = 85
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Connection pool counters for every server the client talks to"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checkout_started = {}
+        self.pools_created = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def pool_created(self, event):
+        with self._lock:
+            self.pools_created += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    def connection_check_out_started(self, event):
+        # Checkouts are synchronous within the executor thread running them
+        self._checkout_started[threading.get_ident()] = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._checkout_started.pop(threading.get_ident(), None)
+        with self._lock:
+            self.checkout_failures += 1
 
-load_dotenv()
+    def connection_checked_out(self, event):
+        started = self._checkout_started.pop(threading.get_ident(), None)
+        waited = time.perf_counter() - started if started is not None else 0.0
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            self.checkout_wait_total += waited
+            self.checkout_wait_max = max(self.checkout_wait_max, waited)
 
-# MongoDB connection
-mongo_url = os.environ.get('MONGO_URL')
-client = AsyncIOMotorClient(mongo_url)
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pools_created": self.pools_created,
+                "connections_created": self.connections_created,
+                "connections_closed": self.connections_closed,
+                "connections_open": self.connections_created - self.connections_closed,
+                "checked_out": self.checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checkout_wait_avg_ms": round(self.checkout_wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+            }
+
+
+def pool_options() -> dict:
+    """Connection pool settings taken from the environment"""
+    options = {
+        "maxPoolSize": int(os.environ.get('MONGO_MAX_POOL_SIZE', '100')),
+        "minPoolSize": int(os.environ.get('MONGO_MIN_POOL_SIZE', '0')),
+    }
+    if os.environ.get('MONGO_MAX_IDLE_TIME_MS'):
+        options["maxIdleTimeMS"] = int(os.environ['MONGO_MAX_IDLE_TIME_MS'])
+    if os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS'):
+        options["waitQueueTimeoutMS"] = int(os.environ['MONGO_WAIT_QUEUE_TIMEOUT_MS'])
+    if os.environ.get('MONGO_COMPRESSORS'):
+        options["compressors"] = os.environ['MONGO_COMPRESSORS']
+    return options
+
+
+# MongoDB connection: the only client in the process
+pool_listener = PoolStatsListener()
+mongo_url = os.environ['MONGO_URL']
+client = AsyncIOMotorClient(
+    mongo_url,
+    event_listeners=[pool_listener, command_listener],
+    **pool_options()
+)
 db = client[os.environ.get('DB_NAME', 'portfolio_db')]
 
 def get_database():
     """Get database instance"""
     return db
 
+def get_pool_stats() -> dict:
+    """Get connection pool statistics"""
+    return pool_listener.stats()
+
+async def prewarm_connections(count: int):
+    """Open ``count`` pooled connections before the first request needs them"""
+    if count <= 0:
+        return
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(count)))
+
+def _key_pattern(keys) -> list:
+    return [(field, int(direction) if isinstance(direction, (int, float)) else direction)
+            for field, direction in keys]
+
+def _index_options(spec) -> dict:
+    options = {"unique": spec.unique}
+    if spec.expire_after_seconds is not None:
+        options["expireAfterSeconds"] = spec.expire_after_seconds
+    return options
+
+def _expire_after(index: dict):
+    # Older servers store the TTL as a double
+    value = index.get("expireAfterSeconds")
+    return None if value is None else int(value)
+
+async def _create_index(spec):
+    try:
+        await db[spec.collection].create_index(spec.keys, name=spec.name, **_index_options(spec))
+    except OperationFailure as e:
+        if e.code != INDEX_OPTIONS_CONFLICT or spec.expire_after_seconds is None:
+            raise
+        # The TTL setting changed since the index was built: update it in place
+        await db.command("collMod", spec.collection, index={
+            "keyPattern": SON(spec.keys),
+            "expireAfterSeconds": spec.expire_after_seconds,
+        })
+        print(f"Updated TTL of index {spec.collection}.{spec.name} to {spec.expire_after_seconds}s")
+
+async def ensure_indexes():
+    """Create every index in the registry concurrently"""
+    results = await asyncio.gather(*(_create_index(spec) for spec in INDEXES), return_exceptions=True)
+    for spec, result in zip(INDEXES, results):
+        if isinstance(result, Exception):
+            print(f"Error creating index {spec.collection}.{spec.name}: {str(result)}")
+
+async def verify_indexes() -> dict:
+    """Compare the indexes in MongoDB with the registry"""
+    collections = sorted({spec.collection for spec in INDEXES})
+    infos = await asyncio.gather(*(db[name].index_information() for name in collections))
+    existing = dict(zip(collections, infos))
+
+    report = {"missing": [], "ttl_mismatch": [], "redundant": [], "unregistered": []}
+    for spec in INDEXES:
+        matches = [index for index in existing[spec.collection].values()
+                   if _key_pattern(index["key"]) == spec.keys]
+        if not matches:
+            report["missing"].append(f"{spec.collection}.{spec.name}")
+        elif _expire_after(matches[0]) != spec.expire_after_seconds:
+            report["ttl_mismatch"].append(
+                f"{spec.collection}.{spec.name} "
+                f"(expireAfterSeconds {_expire_after(matches[0])}, want {spec.expire_after_seconds})"
+            )
+
+    for collection, info in existing.items():
+        registered = [spec.keys for spec in INDEXES if spec.collection == collection]
+        patterns = [_key_pattern(index["key"]) for index in info.values()]
+        for name, index in info.items():
+            keys = _key_pattern(index["key"])
+            if name == "_id_" or keys in registered:
+                continue
+            # A non-unique index whose keys prefix another index (traversed in
+            # either direction) is never needed
+            reversed_keys = [(field, -direction) if isinstance(direction, int) else (field, direction)
+                             for field, direction in keys]
+            covered = any(
+                len(other) > len(keys) and other[:len(keys)] in (keys, reversed_keys)
+                for other in patterns
+            )
+            if covered and not index.get("unique"):
+                report["redundant"].append(f"{collection}.{name}")
+            else:
+                report["unregistered"].append(f"{collection}.{name}")
+    return report
+
 async def init_database():
     """Initialize database with indexes"""
     try:
         # Create indexes for better performance
-        await db.contact_messages.create_index("created_at")
-        await db.contact_messages.create_index("status")
-        await db.contact_messages.create_index("email")
+        await ensure_indexes()
         
-        await db.projects.create_index("created_at")
-        await db.projects.create_index("featured")
+        report = await verify_indexes()
+        for problem, names in report.items():
+            if names:
+                print(f"Index check - {problem}: {', '.join(names)}")
         
-        await db.education.create_index("created_at")
-        await db.experience.create_index("created_at")
-        await db.achievements.create_index("created_at")
+        prewarm = int(os.environ.get('MONGO_PREWARM_CONNECTIONS', os.environ.get('MONGO_MIN_POOL_SIZE', '0')))
+        await prewarm_connections(prewarm)
         
         print("Database initialized successfully")
         
@@ -35,4 +236,4 @@ async def init_database():
 
 async def close_database():
     """Close database connection"""
-    client.close()
\ No newline at end of file
+    client.close()
@@ -0,0 +1,100 @@
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional, Set
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+MATCH_MODES = ("all", "any")
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+def normalize_tag(tag: str) -> str:
+    """Case- and whitespace-insensitive form of a technology name"""
+    return _SPACES_RE.sub(" ", tag.strip()).casefold()
+
+
+class TechFacetIndex:
+    """Technology -> project id postings, mirroring the multikey index on
+    ``projects.technologies``
+
+    Besides facet counts, it remembers every spelling seen for a tag so a
+    case-insensitive filter can be sent to MongoDB as an exact ``$in`` that
+    the multikey index can serve.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._project_tags: Dict[str, Dict[str, Counter]] = {}
+        self._spellings: Dict[str, Counter] = defaultdict(Counter)
+
+    def __len__(self) -> int:
+        return len(self._project_tags)
+
+    def add(self, project: dict) -> None:
+        """Index (or re-index) one project"""
+        self.remove(project["id"])
+        tags: Dict[str, Counter] = defaultdict(Counter)
+        for raw in project.get("technologies") or []:
+            tag = normalize_tag(raw)
+            if tag:
+                tags[tag][raw] += 1
+        for tag, spellings in tags.items():
+            self._postings[tag].add(project["id"])
+            self._spellings[tag].update(spellings)
+        self._project_tags[project["id"]] = dict(tags)
+
+    def remove(self, project_id: str) -> None:
+        """Drop one project from the index if present"""
+        for tag, spellings in self._project_tags.pop(project_id, {}).items():
+            self._postings[tag].discard(project_id)
+            self._spellings[tag].subtract(spellings)
+            self._spellings[tag] = +self._spellings[tag]
+            if not self._postings[tag]:
+                del self._postings[tag]
+                self._spellings.pop(tag, None)
+
+    async def rebuild(self, db) -> int:
+        """Rebuild the index from MongoDB"""
+        fresh = TechFacetIndex()
+        async for project in db.projects.find({}, {"_id": 0, "id": 1, "technologies": 1}):
+            fresh.add(project)
+        self.__dict__.update(fresh.__dict__)
+        logger.info(f"Technology facet index rebuilt: {len(self._postings)} technologies")
+        return len(self._project_tags)
+
+    def label(self, tag: str) -> str:
+        """Most common spelling of a normalized tag"""
+        spellings = self._spellings.get(tag)
+        return spellings.most_common(1)[0][0] if spellings else tag
+
+    def match(self, tags: Iterable[str], mode: str = "all") -> Set[str]:
+        """Ids of projects using all (or any) of ``tags``"""
+        postings = [self._postings.get(normalize_tag(tag), set()) for tag in tags]
+        if not postings:
+            return set(self._project_tags)
+        if mode == "any":
+            return set().union(*postings)
+        return set.intersection(*postings)
+
+    def mongo_filter(self, tags: Iterable[str], mode: str = "all") -> dict:
+        """Exact-spelling filter on ``technologies`` for the multikey index"""
+        variants = [list(self._spellings.get(normalize_tag(tag), {})) for tag in tags]
+        if mode == "any":
+            return {"technologies": {"$in": sorted({v for group in variants for v in group})}}
+        return {"$and": [{"technologies": {"$in": group}} for group in variants]}
+
+    def counts(self, project_ids: Optional[Set[str]] = None) -> Dict[str, int]:
+        """Technology -> project count, over ``project_ids`` or all projects"""
+        if project_ids is None:
+            counts = {tag: len(ids) for tag, ids in self._postings.items()}
+        else:
+            counts = Counter()
+            for project_id in project_ids:
+                counts.update(self._project_tags.get(project_id, {}).keys())
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return {self.label(tag): count for tag, count in ranked}
+
+
+tech_index = TechFacetIndex()
@@ -0,0 +1,39 @@
+from fastapi import HTTPException, Query
+from typing import Optional, Tuple, Type
+from pydantic import BaseModel
+from pagination import PAGE_SORT
+
+# Always returned, so list rows stay addressable
+ALWAYS_INCLUDED = ("id",)
+# Needed to build the next-page cursor even when not returned
+KEYSET_FIELDS = tuple(field for field, _ in PAGE_SORT)
+
+
+def sparse_fields(model: Type[BaseModel]):
+    """Dependency for a ``fields=a,b`` query parameter, validated against ``model``
+
+    Resolves to None when the parameter is absent (every field), else to
+    the requested field names in model order.
+    """
+    allowed = tuple(model.model_fields)
+
+    def dependency(
+        fields: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(allowed)}")
+    ) -> Optional[Tuple[str, ...]]:
+        if fields is None:
+            return None
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = sorted(requested - set(allowed))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        requested.update(ALWAYS_INCLUDED)
+        return tuple(field for field in allowed if field in requested)
+
+    return dependency
+
+
+def projection(fields: Optional[Tuple[str, ...]]) -> dict:
+    """Mongo projection for a sparse fieldset (plus the keyset fields)"""
+    if fields is None:
+        return {"_id": 0}
+    return {"_id": 0, **{field: 1 for field in (*fields, *KEYSET_FIELDS)}}
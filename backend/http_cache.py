@@ -0,0 +1,143 @@
+from fastapi import Request, Response
+from typing import Dict, Iterable, NamedTuple, Optional
+import gzip
+import hashlib
+import os
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Public read endpoints may be cached by browsers and the CDN; admin
+# endpoints are private and always revalidated with the ETag.
+HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', '60'))
+HTTP_CACHE_STALE_WHILE_REVALIDATE = int(os.environ.get('HTTP_CACHE_STALE_WHILE_REVALIDATE', '600'))
+
+PUBLIC_CACHE_CONTROL = os.environ.get(
+    'PUBLIC_CACHE_CONTROL',
+    f"public, max-age={HTTP_CACHE_MAX_AGE}, "
+    f"stale-while-revalidate={HTTP_CACHE_STALE_WHILE_REVALIDATE}"
+)
+PRIVATE_CACHE_CONTROL = os.environ.get('PRIVATE_CACHE_CONTROL', 'private, no-cache')
+
+# Content-Encoding -> compress(body, level); the level is up to the caller
+COMPRESSORS = {"gzip": lambda body, level: gzip.compress(body, compresslevel=level, mtime=0)}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda body, level: brotli.compress(body, quality=level)
+
+# Preferred order when the client weighs encodings equally
+ENCODINGS = tuple(encoding for encoding in ("br", "gzip") if encoding in COMPRESSORS)
+
+
+class JSONPayload(NamedTuple):
+    """A serialized JSON body together with its strong ETag"""
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "JSONPayload":
+        return cls(body=body, etag=compute_etag(body))
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag derived from the response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Iterable[str]) -> str:
+    """Pick the best of ``available`` ("br", "gzip") for an Accept-Encoding
+    header; "identity" when the client accepts none of them"""
+    if not accept_encoding:
+        return "identity"
+
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    best, best_quality = "identity", 0.0
+    for coding in available:
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress_body(body: bytes, encoding: str, levels: Dict[str, int]) -> bytes:
+    """``body`` compressed with ``encoding`` at the caller's level for it"""
+    return COMPRESSORS[encoding](body, levels[encoding])
+
+
+def variant_etag(etag: str, encoding: str) -> str:
+    """Distinct strong ETag for a compressed representation"""
+    if encoding == "identity":
+        return etag
+    return etag[:-1] + f'-{encoding}"'
+
+
+def base_etag(etag: str) -> str:
+    """Undo ``variant_etag``: the identity ETag behind an encoded variant"""
+    for encoding in ("gzip", "br"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def etag_matches_any(if_none_match: Optional[str], etag: str, encodings: Iterable[str]) -> bool:
+    """If-None-Match check accepting any encoded variant of ``etag``"""
+    return any(
+        etag_matches(if_none_match, variant_etag(etag, encoding))
+        for encoding in ("identity", *encodings)
+    )
+
+
+def not_modified_response(
+    request: Request,
+    etag: str,
+    cache_control: str = PUBLIC_CACHE_CONTROL
+) -> Optional[Response]:
+    """304 for a request that already has ``etag``, else None; lets callers
+    skip building the body when the ETag is known up front"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
+
+
+def cached_json_response(
+    request: Request,
+    payload: JSONPayload,
+    cache_control: str = PUBLIC_CACHE_CONTROL,
+    extra_headers: Optional[dict] = None
+) -> Response:
+    """Return 304 if the client already has ``payload``, else the full body"""
+    headers = {"ETag": payload.etag, "Cache-Control": cache_control}
+    if extra_headers:
+        headers.update(extra_headers)
+
+    if etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=payload.body, media_type="application/json", headers=headers)
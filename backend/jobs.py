@@ -0,0 +1,248 @@
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+from pymongo import ReturnDocument
+import asyncio
+import logging
+import os
+import random
+import socket
+import uuid
+
+logger = logging.getLogger(__name__)
+
+JOBS_ENABLED = os.environ.get('JOBS_ENABLED', 'true').lower() == 'true'
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '4'))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '5'))
+JOB_BACKOFF_SECONDS = float(os.environ.get('JOB_BACKOFF_SECONDS', '2'))
+JOB_BACKOFF_MAX_SECONDS = float(os.environ.get('JOB_BACKOFF_MAX_SECONDS', '300'))
+# A running job whose lease ran out (worker crashed) is picked up again
+JOB_LEASE_SECONDS = float(os.environ.get('JOB_LEASE_SECONDS', '60'))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', '5'))
+JOB_SHUTDOWN_GRACE_SECONDS = float(os.environ.get('JOB_SHUTDOWN_GRACE_SECONDS', '10'))
+
+# queued -> running -> done | (queued again with backoff) -> failed
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+class Retry(NamedTuple):
+    """Outcome for one job of a batch that should run again later"""
+    error: str
+    max_attempts: Optional[int] = None  # lower cap than the queue's, if any
+
+
+# Returns the jobs to retry by position in ``payloads``; the rest are done
+Handler = Callable[[object, List[dict]], Awaitable[Optional[Dict[int, Retry]]]]
+
+
+class JobType(NamedTuple):
+    handler: Handler
+    batch_size: int
+
+
+class JobQueue:
+    """In-process worker pool over a durable ``jobs`` collection
+
+    Jobs are inserted before ``enqueue`` returns, so a crash loses nothing:
+    workers claim due jobs with an atomic find_one_and_update and hold a
+    lease while they run; expired leases are claimed again. Failures are
+    retried with exponential backoff up to ``max_attempts``.
+    """
+
+    def __init__(self, workers: int, max_attempts: int, backoff: float, backoff_max: float,
+                 lease: float, poll_interval: float):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._types: Dict[str, JobType] = {}
+        self._db = None
+        self._tasks: List[asyncio.Task] = []
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self.in_flight = 0
+        self.enqueued = 0
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    def register(self, job_type: str, batch_size: int = 1):
+        """Decorator registering ``handler(db, payloads)`` for ``job_type``;
+        up to ``batch_size`` due jobs of the type are handled together
+
+        A handler that raises retries the whole batch; one that returns
+        ``{index: Retry(...)}`` retries just those jobs and finishes the rest.
+        """
+        def decorator(handler: Handler) -> Handler:
+            self._types[job_type] = JobType(handler, batch_size)
+            return handler
+        return decorator
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def enqueue(self, db, jobs: List[tuple]) -> List[str]:
+        """Durably queue ``(job_type, payload)`` pairs in one insert"""
+        now = datetime.utcnow()
+        docs = []
+        for job_type, payload in jobs:
+            if job_type not in self._types:
+                raise ValueError(f"Unknown job type: {job_type}")
+            docs.append({
+                "id": str(uuid.uuid4()),
+                "type": job_type,
+                "payload": payload,
+                "status": "queued",
+                "attempts": 0,
+                "run_at": now,
+                "created_at": now,
+            })
+        if docs:
+            await db.jobs.insert_many(docs, ordered=False)
+            self.enqueued += len(docs)
+            self._wake.set()
+        return [doc["id"] for doc in docs]
+
+    def start(self, db) -> None:
+        if self._tasks:
+            return
+        self._db = db
+        self._stopping = False
+        worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{worker_prefix}:{index}"))
+            for index in range(self.workers)
+        ]
+        logger.info(f"Job queue started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Let running jobs finish (up to the grace period), then stop"""
+        if not self._tasks:
+            return
+        self._stopping = True
+        self._wake.set()
+        _, pending = await asyncio.wait(self._tasks, timeout=JOB_SHUTDOWN_GRACE_SECONDS)
+        for task in pending:
+            # Their leases expire and another worker picks the jobs up
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def _claim(self, worker_id: str, job_type: Optional[str] = None) -> Optional[dict]:
+        now = datetime.utcnow()
+        query = {"$or": [
+            {"status": "queued", "run_at": {"$lte": now}},
+            {"status": "running", "locked_until": {"$lt": now}},
+        ]}
+        if job_type is not None:
+            query["type"] = job_type
+        return await self._db.jobs.find_one_and_update(
+            query,
+            {
+                "$set": {"status": "running", "locked_by": worker_id,
+                         "locked_until": now + timedelta(seconds=self.lease), "started_at": now},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _worker(self, worker_id: str) -> None:
+        while not self._stopping:
+            # Cleared before looking, so an enqueue during the claim still wakes us
+            self._wake.clear()
+            try:
+                job = await self._claim(worker_id)
+            except Exception as e:
+                logger.error(f"Error claiming job: {str(e)}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                batch = [job]
+                job_type = self._types.get(job["type"])
+                if job_type is not None:
+                    while len(batch) < job_type.batch_size:
+                        more = await self._claim(worker_id, job["type"])
+                        if more is None:
+                            break
+                        batch.append(more)
+                await self._run(batch, job_type)
+            except Exception as e:
+                # Claimed jobs come back once their lease expires
+                logger.error(f"Error running {job['type']} job: {str(e)}")
+
+    async def _run(self, batch: List[dict], job_type: Optional[JobType]) -> None:
+        self.in_flight += len(batch)
+        try:
+            if job_type is None:
+                raise ValueError(f"No handler registered for {batch[0]['type']}")
+            retries = await job_type.handler(self._db, [job["payload"] for job in batch]) or {}
+        except Exception as e:
+            logger.error(f"Job {batch[0]['type']} failed ({len(batch)} jobs): {str(e)}")
+            for job in batch:
+                await self._failed(job, str(e))
+        else:
+            done = [job["id"] for index, job in enumerate(batch) if index not in retries]
+            if done:
+                now = datetime.utcnow()
+                await self._db.jobs.update_many(
+                    {"id": {"$in": done}},
+                    {"$set": {"status": "done", "finished_at": now}, "$unset": {"locked_by": "", "locked_until": ""}}
+                )
+                self.completed += len(done)
+            for index, retry in retries.items():
+                await self._failed(batch[index], retry.error, retry.max_attempts)
+        finally:
+            self.in_flight -= len(batch)
+
+    async def _failed(self, job: dict, error: str, max_attempts: Optional[int] = None) -> None:
+        now = datetime.utcnow()
+        update = {"last_error": error}
+        if job["attempts"] >= min(self.max_attempts, max_attempts or self.max_attempts):
+            update.update({"status": "failed", "finished_at": now})
+            self.failed += 1
+        else:
+            delay = min(self.backoff_max, self.backoff * 2 ** (job["attempts"] - 1))
+            update.update({"status": "queued", "run_at": now + timedelta(seconds=delay * random.uniform(0.8, 1.2))})
+            self.retried += 1
+        await self._db.jobs.update_one(
+            {"id": job["id"]},
+            {"$set": update, "$unset": {"locked_by": "", "locked_until": ""}}
+        )
+
+    async def counts(self, db) -> Dict[str, int]:
+        """Jobs in the collection by status"""
+        counts = {status: 0 for status in JOB_STATUSES}
+        async for row in db.jobs.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+        return counts
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "workers": len(self._tasks),
+            "in_flight": self.in_flight,
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+job_queue = JobQueue(
+    workers=JOB_WORKERS,
+    max_attempts=JOB_MAX_ATTEMPTS,
+    backoff=JOB_BACKOFF_SECONDS,
+    backoff_max=JOB_BACKOFF_MAX_SECONDS,
+    lease=JOB_LEASE_SECONDS,
+    poll_interval=JOB_POLL_INTERVAL,
+)
@@ -0,0 +1,32 @@
+from fastapi import Request
+from coherence import VERSIONS_ID, cache_coherence
+from http_cache import compute_etag
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# List ETags come from the per-collection write counters in cache_versions
+# (bumped by every API writer, see coherence.py) rather than from the body,
+# so a matching If-None-Match is answered before the page is fetched. The
+# epoch rolls the ETag over now and then for writes that bypass the API.
+LIST_ETAG_EPOCH_SECONDS = float(os.environ.get(
+    'LIST_ETAG_EPOCH_SECONDS', os.environ.get('PORTFOLIO_CACHE_TTL', '300')
+))
+
+
+async def list_etag(db, collection: str, request: Request) -> str:
+    """ETag for a list response: collection version plus the query string"""
+    doc = await db.cache_versions.find_one({"_id": VERSIONS_ID}, {collection: 1})
+    version = (doc or {}).get(collection, 0)
+    epoch = int(time.time() // LIST_ETAG_EPOCH_SECONDS) if LIST_ETAG_EPOCH_SECONDS > 0 else 0
+    return compute_etag(f"{collection}:{version}:{epoch}:{request.url.query}".encode())
+
+
+async def collection_changed(db, collection: str) -> None:
+    """Bump ``collection``'s version after a committed write; never raises"""
+    try:
+        await cache_coherence.publish(db, collection)
+    except Exception as e:
+        logger.error(f"Error bumping {collection} version: {str(e)}")
@@ -0,0 +1,219 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from pymongo import monitoring
+from starlette.routing import Match
+import threading
+import time
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with quantile estimates"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside its bucket"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def cumulative(self) -> Iterable[Tuple[str, int]]:
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield repr(bound), total
+        yield "+Inf", self.count
+
+
+class MetricsRegistry:
+    """Request and MongoDB command metrics for the Prometheus endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self.request_latency: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.in_flight: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.commands: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self.command_latency: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+
+    def request_started(self, method: str, route: str) -> None:
+        self.in_flight[(method, route)] += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float) -> None:
+        self.in_flight[(method, route)] -= 1
+        self.requests[(method, route, str(status))] += 1
+        self.request_latency[(method, route)].observe(seconds)
+
+    def command_finished(self, collection: str, operation: str, outcome: str, seconds: float) -> None:
+        # Called from the driver's executor threads
+        with self._lock:
+            self.commands[(collection, operation, outcome)] += 1
+            self.command_latency[(collection, operation)].observe(seconds)
+
+    def render(self, gauges: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family("portfolio_http_requests_total", "counter", "HTTP requests by route and status")
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f'portfolio_http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+
+        family("portfolio_http_requests_in_flight", "gauge", "HTTP requests currently being handled")
+        for (method, route), count in sorted(self.in_flight.items()):
+            lines.append(f'portfolio_http_requests_in_flight{{method="{method}",route="{route}"}} {count}')
+
+        family("portfolio_http_request_duration_seconds", "histogram", "HTTP request latency")
+        for (method, route), histogram in sorted(self.request_latency.items()):
+            _render_histogram(lines, "portfolio_http_request_duration_seconds",
+                              f'method="{method}",route="{route}"', histogram)
+
+        family("portfolio_http_request_duration_quantile_seconds", "gauge", "Estimated HTTP latency quantiles")
+        for (method, route), histogram in sorted(self.request_latency.items()):
+            for q in QUANTILES:
+                lines.append(f'portfolio_http_request_duration_quantile_seconds'
+                             f'{{method="{method}",route="{route}",quantile="{q}"}} {histogram.quantile(q):.6f}')
+
+        with self._lock:
+            commands = sorted(self.commands.items())
+            command_latency = sorted(self.command_latency.items())
+
+        family("portfolio_mongo_commands_total", "counter", "MongoDB commands by collection, operation and outcome")
+        for (collection, operation, outcome), count in commands:
+            lines.append(f'portfolio_mongo_commands_total'
+                         f'{{collection="{collection}",operation="{operation}",outcome="{outcome}"}} {count}')
+
+        family("portfolio_mongo_command_duration_seconds", "histogram", "MongoDB command latency")
+        for (collection, operation), histogram in command_latency:
+            _render_histogram(lines, "portfolio_mongo_command_duration_seconds",
+                              f'collection="{collection}",operation="{operation}"', histogram)
+
+        family("portfolio_mongo_command_duration_quantile_seconds", "gauge", "Estimated MongoDB latency quantiles")
+        for (collection, operation), histogram in command_latency:
+            for q in QUANTILES:
+                lines.append(f'portfolio_mongo_command_duration_quantile_seconds'
+                             f'{{collection="{collection}",operation="{operation}",quantile="{q}"}} {histogram.quantile(q):.6f}')
+
+        for group, values in (gauges or {}).items():
+            for key, value in values.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if not isinstance(value, (int, float)):
+                    continue
+                name = f"portfolio_{group}_{key}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _render_histogram(lines: List[str], name: str, labels: str, histogram: Histogram) -> None:
+    for bound, count in histogram.cumulative():
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Times every MongoDB command by collection and operation"""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self._pending: Dict[Tuple[int, int], Tuple[str, str]] = {}
+
+    def started(self, event):
+        command_name = event.command_name
+        target = event.command.get(command_name)
+        collection = target if isinstance(target, str) else event.database_name
+        self._pending[(event.request_id, event.operation_id)] = (collection, command_name)
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "failure")
+
+    def _finish(self, event, outcome: str) -> None:
+        collection, operation = self._pending.pop(
+            (event.request_id, event.operation_id), (event.database_name, event.command_name)
+        )
+        self.registry.command_finished(collection, operation, outcome, event.duration_micros / 1e6)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route request count, latency and in-flight"""
+
+    MAX_CACHED_PATHS = 2048
+
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.registry = registry or metrics_registry
+        self._route_cache: Dict[Tuple[str, str], str] = {}
+
+    def _route_template(self, scope) -> str:
+        # Label by route template, not raw path, to keep cardinality bounded
+        key = (scope["method"], scope["path"])
+        route = self._route_cache.get(key)
+        if route is None:
+            route = "unmatched"
+            for candidate in scope["app"].router.routes:
+                match, _ = candidate.matches(scope)
+                if match == Match.FULL:
+                    route = candidate.path
+                    break
+            if len(self._route_cache) >= self.MAX_CACHED_PATHS:
+                self._route_cache.clear()
+            self._route_cache[key] = route
+        return route
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_template(scope)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.registry.request_started(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.request_finished(method, route, status, time.perf_counter() - started)
+
+
+metrics_registry = MetricsRegistry()
+command_listener = MongoCommandListener(metrics_registry)
@@ -1,9 +1,11 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime
 import uuid
 
 # Contact Form Models
+MESSAGE_STATUSES = ["new", "read", "replied"]
+
 class ContactMessage(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
@@ -12,6 +14,10 @@ class ContactMessage(BaseModel):
     message: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
     status: str = "new"  # new, read, replied
+    # Filled in by the background jobs after submission
+    spam_score: Optional[float] = None
+    spam: bool = False
+    tags: List[str] = []
 
 class ContactMessageCreate(BaseModel):
     name: str
@@ -36,6 +42,7 @@ class HeroSection(BaseModel):
     resume_url: Optional[str] = None
     social_links: SocialLinks
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    revision: Optional[int] = None  # set on every write, see revisions.py
 
 class AboutSection(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -44,6 +51,7 @@ class AboutSection(BaseModel):
     highlights: List[str]
     image_url: Optional[str] = None
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    revision: Optional[int] = None  # set on every write, see revisions.py
 
 class SkillCategory(BaseModel):
     name: str
@@ -54,6 +62,7 @@ class SkillsSection(BaseModel):
     title: str
     categories: List[SkillCategory]
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    revision: Optional[int] = None  # set on every write, see revisions.py
 
 class Project(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -65,6 +74,8 @@ class Project(BaseModel):
     image_url: Optional[str] = None
     featured: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = None
+    revision: Optional[int] = None  # set on every write, see revisions.py
 
 class ProjectCreate(BaseModel):
     title: str
@@ -86,6 +97,8 @@ class Education(BaseModel):
     percentage: Optional[str] = None
     description: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = None
+    revision: Optional[int] = None  # set on every write, see revisions.py
 
 class EducationCreate(BaseModel):
     degree: str
@@ -107,6 +120,8 @@ class Experience(BaseModel):
     description: str
     achievements: Optional[List[str]] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = None
+    revision: Optional[int] = None  # set on every write, see revisions.py
 
 class ExperienceCreate(BaseModel):
     position: str
@@ -124,6 +139,8 @@ class Achievement(BaseModel):
     date: str
     type: str  # Competition, Academic, Certification, etc.
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = None
+    revision: Optional[int] = None  # set on every write, see revisions.py
 
 class AchievementCreate(BaseModel):
     title: str
@@ -140,6 +157,20 @@ class ContactInfo(BaseModel):
     location: str
     social_links: SocialLinks
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    revision: Optional[int] = None  # set on every write, see revisions.py
+
+# Bulk Import Models
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: str  # created, updated, error
+    error: Optional[str] = None
+
+class BulkWriteSummary(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[BulkItemResult]
 
 # Portfolio Summary Model
 class PortfolioData(BaseModel):
@@ -150,4 +181,75 @@ class PortfolioData(BaseModel):
     education: List[Education]
     experience: List[Experience]
     achievements: List[Achievement]
-    contact: ContactInfo
\ No newline at end of file
+    contact: ContactInfo
+
+# Collections whose documents are keyed by ``id``, with their stored model
+COLLECTION_MODELS = {
+    "contact_messages": ContactMessage,
+    "projects": Project,
+    "education": Education,
+    "experience": Experience,
+    "achievements": Achievement,
+}
+
+# Index Registry
+class IndexSpec(BaseModel):
+    collection: str
+    keys: List[Tuple[str, int]]
+    unique: bool = False
+    expire_after_seconds: Optional[int] = None  # TTL index
+
+    @property
+    def name(self) -> str:
+        """MongoDB's default name for this key pattern"""
+        return "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+def _id_index(collection: str) -> IndexSpec:
+    return IndexSpec(collection=collection, keys=[("id", 1)], unique=True)
+
+def _recent_first_index(collection: str) -> IndexSpec:
+    # Backs keyset pagination on (created_at, id)
+    return IndexSpec(collection=collection, keys=[("created_at", -1), ("id", -1)])
+
+INDEXES: List[IndexSpec] = [
+    # Contact messages
+    _id_index("contact_messages"),
+    _recent_first_index("contact_messages"),
+    IndexSpec(collection="contact_messages", keys=[("status", 1), ("created_at", -1)]),
+    IndexSpec(collection="contact_messages", keys=[("email", 1)]),
+
+    # Portfolio lists
+    _id_index("projects"),
+    _recent_first_index("projects"),
+    IndexSpec(collection="projects", keys=[("featured", 1), ("created_at", -1)]),
+    IndexSpec(collection="projects", keys=[("technologies", 1)]),  # multikey, for tech filters
+    _id_index("education"),
+    _recent_first_index("education"),
+    _id_index("experience"),
+    _recent_first_index("experience"),
+    _id_index("achievements"),
+    _recent_first_index("achievements"),
+
+    # Portfolio sections
+    _id_index("hero"),
+    _id_index("about"),
+    _id_index("skills"),
+    _id_index("contact"),
+
+    # Delta sync: every portfolio document and tombstone by revision
+    *[IndexSpec(collection=section, keys=[("revision", 1)])
+      for section in ("hero", "about", "skills", "contact", "projects", "education", "experience", "achievements")],
+    IndexSpec(collection="portfolio_tombstones", keys=[("revision", 1)]),
+
+    # Status checks: rollups carry their own expiry time. The TTL indexes
+    # whose expiry comes from the environment are added in database.py,
+    # after backend/.env is loaded.
+    IndexSpec(collection="status_rollups", keys=[("granularity", 1), ("bucket", 1), ("client_name", 1)],
+              unique=True),
+    IndexSpec(collection="status_rollups", keys=[("expires_at", 1)], expire_after_seconds=0),
+
+    # Background jobs: claim queries, then finished jobs expire
+    _id_index("jobs"),
+    IndexSpec(collection="jobs", keys=[("status", 1), ("run_at", 1)]),
+    IndexSpec(collection="jobs", keys=[("status", 1), ("locked_until", 1)]),
+]
@@ -0,0 +1,85 @@
+from fastapi import HTTPException, Query, Request
+from datetime import datetime
+from typing import List, Optional, Tuple
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Keyset order shared by every list endpoint; backed by the
+# (created_at, id) compound indexes created in database.init_database
+PAGE_SORT = [("created_at", -1), ("id", -1)]
+
+
+class PageParams:
+    """Validated ``limit``/``cursor`` query parameters"""
+
+    def __init__(self, limit: int, after: Optional[Tuple[datetime, str]]):
+        self.limit = limit
+        self.after = after
+
+
+def encode_cursor(doc: dict) -> str:
+    """Opaque token pointing just after ``doc`` in PAGE_SORT order"""
+    raw = json.dumps({"t": doc["created_at"].isoformat(), "id": doc["id"]})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, str]:
+    """Decode a token produced by encode_cursor"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(raw["t"]), str(raw["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
+) -> PageParams:
+    """Dependency for paginated list endpoints"""
+    return PageParams(limit=limit, after=decode_cursor(cursor) if cursor else None)
+
+
+def keyset_filter(after: Optional[Tuple[datetime, str]], base: Optional[dict] = None) -> dict:
+    """Mongo filter selecting documents that sort after ``after``"""
+    query = dict(base or {})
+    if after is None:
+        return query
+
+    created_at, doc_id = after
+    seek = {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "id": {"$lt": doc_id}},
+    ]}
+    return {"$and": [query, seek]} if query else seek
+
+
+async def fetch_page(
+    collection,
+    page: PageParams,
+    query: Optional[dict] = None,
+    projection: Optional[dict] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """Fetch one page of documents and the cursor for the next one"""
+    cursor = collection.find(keyset_filter(page.after, query), projection)
+    docs = await cursor.sort(PAGE_SORT).limit(page.limit + 1).to_list(page.limit + 1)
+
+    if len(docs) > page.limit:
+        docs = docs[:page.limit]
+        return docs, encode_cursor(docs[-1])
+    return docs, None
+
+
+def page_headers(request: Request, next_cursor: Optional[str]) -> dict:
+    """X-Next-Cursor and Link headers for a page response"""
+    if not next_cursor:
+        return {}
+    next_url = request.url.include_query_params(cursor=next_cursor)
+    return {
+        "X-Next-Cursor": next_cursor,
+        "Link": f'<{next_url}>; rel="next"',
+    }
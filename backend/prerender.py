@@ -0,0 +1,132 @@
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+from http_cache import (
+    ENCODINGS, JSONPayload, PUBLIC_CACHE_CONTROL, compress_body, etag_matches_any,
+    negotiate_encoding, variant_etag
+)
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+PRERENDER_ENABLED = os.environ.get('PRERENDER_ENABLED', 'true').lower() == 'true'
+PRERENDER_DIR = Path(os.environ.get('PRERENDER_DIR', Path(__file__).parent / '.prerender'))
+PRERENDER_TTL = float(os.environ.get('PRERENDER_TTL', os.environ.get('PORTFOLIO_CACHE_TTL', '300')))
+# Files of superseded versions are kept this long for in-flight sendfiles
+PRERENDER_RETAIN_SECONDS = 60
+
+# Rendered once per version, so spend the CPU on the smallest files
+PRERENDER_LEVELS = {"gzip": 9, "br": 11}
+
+FILE_SUFFIXES = {"identity": ".json", "gzip": ".json.gz", "br": ".json.br"}
+
+
+class PrerenderedPayload(NamedTuple):
+    etag: str
+    files: Dict[str, Path]
+    rendered_at: float
+
+
+class PortfolioPrerenderer:
+    """Writes the assembled portfolio JSON to disk, plain and pre-compressed,
+    so GET /api/portfolio can be served like a static file"""
+
+    def __init__(self, directory: Path, ttl: float, enabled: bool = True):
+        self.directory = directory
+        self.ttl = ttl
+        self.enabled = enabled
+        self.current: Optional[PrerenderedPayload] = None
+        self.generation = 0
+        self.served = 0
+        self.renders = 0
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self.current = None
+
+    def _write(self, payload: JSONPayload) -> PrerenderedPayload:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = "portfolio-" + payload.etag.strip('"')
+        bodies = {"identity": payload.body}
+        for encoding in ENCODINGS:
+            bodies[encoding] = compress_body(payload.body, encoding, PRERENDER_LEVELS)
+
+        files = {}
+        for encoding, body in bodies.items():
+            path = self.directory / (stem + FILE_SUFFIXES[encoding])
+            if not path.exists():
+                # Atomic publish: readers never see a half-written file
+                tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                tmp.write_bytes(body)
+                os.replace(tmp, path)
+            files[encoding] = path
+
+        self._remove_superseded(stem)
+        return PrerenderedPayload(etag=payload.etag, files=files, rendered_at=time.monotonic())
+
+    def _remove_superseded(self, keep_stem: str) -> None:
+        cutoff = time.time() - PRERENDER_RETAIN_SECONDS
+        for path in self.directory.glob("portfolio-*"):
+            if path.name.startswith(keep_stem):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+    async def render(self, payload: JSONPayload, generation: Optional[int] = None) -> None:
+        """Write ``payload`` to disk (off the event loop) and serve it from now on,
+        unless an invalidation happened since ``generation`` was read"""
+        if not self.enabled:
+            return
+        try:
+            rendered = await asyncio.to_thread(self._write, payload)
+            self.renders += 1
+            if generation is None or generation == self.generation:
+                self.current = rendered
+        except Exception as e:
+            logger.error(f"Error pre-rendering portfolio: {str(e)}")
+            self.current = None
+
+    def response(self, request: Request) -> Optional[Response]:
+        """A file response for the current render, or None if it is missing or stale"""
+        current = self.current
+        if current is None or time.monotonic() - current.rendered_at > self.ttl:
+            return None
+
+        encodings = [encoding for encoding in ("br", "gzip") if encoding in current.files]
+        headers = {"Cache-Control": PUBLIC_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+        if etag_matches_any(request.headers.get("if-none-match"), current.etag, encodings):
+            encoding = negotiate_encoding(request.headers.get("accept-encoding"), encodings)
+            headers["ETag"] = variant_etag(current.etag, encoding)
+            return Response(status_code=304, headers=headers)
+
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"), encodings)
+        path = current.files[encoding]
+        if not path.exists():
+            self.current = None
+            return None
+
+        headers["ETag"] = variant_etag(current.etag, encoding)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        self.served += 1
+        return FileResponse(path, media_type="application/json", headers=headers)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "current": self.current.etag if self.current else None,
+            "encodings": sorted(self.current.files) if self.current else [],
+            "renders": self.renders,
+            "served": self.served,
+        }
+
+
+portfolio_prerenderer = PortfolioPrerenderer(PRERENDER_DIR, PRERENDER_TTL, PRERENDER_ENABLED)
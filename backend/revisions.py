@@ -0,0 +1,158 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Optional
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from snapshot import SECTIONS
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+REVISION_ID = "portfolio"
+DEFAULT_CHANGES_LIMIT = 500
+# A reservation not released within this long is treated as abandoned
+# (crashed writer), so it stops holding back the changes feed
+REVISION_LEASE_SECONDS = float(os.environ.get('REVISION_LEASE_SECONDS', '600'))
+
+
+async def _reserve(db, count: int) -> int:
+    """Advance the counter by ``count`` and record the range as pending, in
+    one compare-and-set on the counter document; returns the first revision"""
+    while True:
+        doc = await db.portfolio_revision.find_one({"_id": REVISION_ID}) or {}
+        value = doc.get("value", 0)
+        now = datetime.utcnow()
+        if any(lease["expires_at"] <= now for lease in doc.get("pending", [])):
+            await db.portfolio_revision.update_one(
+                {"_id": REVISION_ID}, {"$pull": {"pending": {"expires_at": {"$lte": now}}}}
+            )
+        lease = {"first": value + 1, "expires_at": now + timedelta(seconds=REVISION_LEASE_SECONDS)}
+        try:
+            result = await db.portfolio_revision.update_one(
+                {"_id": REVISION_ID, "value": value},
+                {"$set": {"value": value + count}, "$push": {"pending": lease}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            continue  # another writer created the counter first
+        if result.modified_count or result.upserted_id is not None:
+            return value + 1
+
+
+@asynccontextmanager
+async def reserve_revisions(db, count: int = 1) -> AsyncIterator[Optional[int]]:
+    """Reserve ``count`` consecutive revisions for one write; yields the first
+
+    Until the block exits, changes_since holds back everything from the
+    first reserved revision on, however long the write takes, so a faster
+    writer's later revision can't be handed out ahead of it.
+    """
+    if count <= 0:
+        yield None
+        return
+    first = await _reserve(db, count)
+    try:
+        yield first
+    finally:
+        try:
+            await db.portfolio_revision.update_one(
+                {"_id": REVISION_ID}, {"$pull": {"pending": {"first": first}}}
+            )
+        except Exception as e:
+            # The lease expires on its own
+            logger.error(f"Error releasing portfolio revision {first}: {str(e)}")
+
+
+def stamp_documents(docs: List[dict], first: int) -> None:
+    """Give a batch of documents consecutive revisions from ``first`` and a
+    shared updated_at"""
+    updated_at = datetime.utcnow()
+    for offset, doc in enumerate(docs):
+        doc["revision"] = first + offset
+        doc["updated_at"] = updated_at
+
+
+async def visible_revision(db) -> int:
+    """Highest revision below which every write has finished (or given up)"""
+    doc = await db.portfolio_revision.find_one({"_id": REVISION_ID}) or {}
+    now = datetime.utcnow()
+    return min([doc.get("value", 0)] + [
+        lease["first"] - 1 for lease in doc.get("pending", []) if lease["expires_at"] > now
+    ])
+
+
+async def record_deletion(db, collection: str, doc_id: str) -> int:
+    """Leave a tombstone so delta clients learn about the delete"""
+    async with reserve_revisions(db) as revision:
+        await db.portfolio_tombstones.insert_one({
+            "collection": collection,
+            "id": doc_id,
+            "revision": revision,
+            "updated_at": datetime.utcnow(),
+        })
+    return revision
+
+
+async def backfill(db) -> int:
+    """Give documents written before revisions existed one each"""
+    total = 0
+    for collection in SECTIONS:
+        docs = await db[collection].find({"revision": {"$exists": False}}, {"_id": 0, "id": 1}).to_list(None)
+        docs = [doc for doc in docs if "id" in doc]
+        if not docs:
+            continue
+        async with reserve_revisions(db, len(docs)) as first:
+            await db[collection].bulk_write([
+                UpdateOne({"id": doc["id"], "revision": {"$exists": False}}, {"$set": {"revision": first + offset}})
+                for offset, doc in enumerate(docs)
+            ], ordered=False)
+        total += len(docs)
+    if total:
+        logger.info(f"Assigned revisions to {total} existing portfolio documents")
+    return total
+
+
+async def changes_since(db, since: int, limit: int = DEFAULT_CHANGES_LIMIT) -> dict:
+    """Upserts and deletes with a revision above ``since``, oldest first
+
+    Stops below the oldest write still in flight. ``revision`` is where the
+    client resumes; ``has_more`` is only set when ``limit`` cut the reply
+    short, never just because a write is still pending.
+    """
+    visible = await visible_revision(db)
+    if visible <= since:
+        return {"since": since, "revision": since, "has_more": False, "changes": []}
+
+    query = {"revision": {"$gt": since, "$lte": visible}}
+    upserts, tombstones = await asyncio.gather(
+        asyncio.gather(*(
+            db[collection].find(query, {"_id": 0}).sort("revision", 1).to_list(limit + 1)
+            for collection in SECTIONS
+        )),
+        db.portfolio_tombstones.find(query, {"_id": 0}).sort("revision", 1).to_list(limit + 1)
+    )
+
+    entries: List[dict] = []
+    for collection, docs in zip(SECTIONS, upserts):
+        entries.extend(
+            {"op": "upsert", "collection": collection, "id": doc.get("id"), "revision": doc["revision"], "doc": doc}
+            for doc in docs
+        )
+    entries.extend(
+        {"op": "delete", "collection": tombstone["collection"], "id": tombstone["id"],
+         "revision": tombstone["revision"]}
+        for tombstone in tombstones
+    )
+    entries.sort(key=lambda entry: entry["revision"])
+
+    has_more = len(entries) > limit
+    changes = entries[:limit]
+    return {
+        "since": since,
+        # Everything up to ``visible`` is settled, gaps from failed writes included
+        "revision": changes[-1]["revision"] if has_more else visible,
+        "has_more": has_more,
+        "changes": changes,
+    }
@@ -1,13 +1,45 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from models import ContactMessage, ContactMessageCreate
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+from models import ContactMessage, ContactMessageCreate, MESSAGE_STATUSES
 from database import get_database
+from http_cache import JSONPayload, PRIVATE_CACHE_CONTROL, cached_json_response, not_modified_response
+from list_versions import collection_changed, list_etag
+from serialization import dumps, trusted_list
+from pagination import PageParams, fetch_page, page_headers, page_params
+from fieldsets import projection, sparse_fields
+from pymongo import ReturnDocument
+import contact_counters
+from contact_buffer import contact_write_buffer
+import contact_jobs
+from admission import (
+    body_field, client_ip, contact_email_limiter, contact_ip_limiter, limit_writes, rate_limit
+)
+import csv
+import io
 import logging
+import os
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-@router.post("/contact/messages", response_model=ContactMessage)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+EXPORT_FIELDS = ["id", "name", "email", "subject", "message", "status", "created_at"]
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '500'))
+
+@router.post(
+    "/contact/messages",
+    response_model=ContactMessage,
+    dependencies=[
+        Depends(rate_limit(contact_ip_limiter, client_ip)),
+        Depends(rate_limit(contact_email_limiter, body_field("email"))),
+        Depends(limit_writes),
+    ]
+)
 async def create_contact_message(message_data: ContactMessageCreate):
     """Submit a contact form message"""
     try:
@@ -15,10 +47,20 @@ async def create_contact_message(message_data: ContactMessageCreate):
         message = ContactMessage(**message_data.dict())
         message_dict = message.dict()
         
+        if contact_write_buffer.running:
+            # Write-behind mode: batched into insert_many by the flusher,
+            # which also queues the jobs for the whole batch
+            await contact_write_buffer.submit(message_dict)
+            logger.info(f"New contact message from {message.email}: {message.subject}")
+            return message
+        
         result = await db.contact_messages.insert_one(message_dict)
         
         if result.acknowledged:
+            await contact_counters.increment(db, message.status)
+            await collection_changed(db, "contact_messages")
             logger.info(f"New contact message from {message.email}: {message.subject}")
+            await contact_jobs.enqueue_processing(db, [message_dict])
             return message
         else:
             raise HTTPException(status_code=500, detail="Failed to submit contact message")
@@ -28,17 +70,121 @@ async def create_contact_message(message_data: ContactMessageCreate):
         raise HTTPException(status_code=500, detail="Failed to submit contact message")
 
 @router.get("/contact/messages", response_model=List[ContactMessage])
-async def get_contact_messages():
+async def get_contact_messages(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(ContactMessage))
+):
     """Get all contact messages (admin only)"""
     try:
         db = get_database()
-        messages = await db.contact_messages.find().sort("created_at", -1).to_list(100)
-        return [ContactMessage(**message) for message in messages]
+        etag = await list_etag(db, "contact_messages", request)
+        not_modified = not_modified_response(request, etag, PRIVATE_CACHE_CONTROL)
+        if not_modified is not None:
+            return not_modified
+        
+        messages, next_cursor = await fetch_page(db.contact_messages, page, projection=projection(fields))
+        body = dumps(trusted_list(ContactMessage, messages, fields))
+        return cached_json_response(
+            request, JSONPayload(body, etag), PRIVATE_CACHE_CONTROL,
+            extra_headers=page_headers(request, next_cursor)
+        )
         
     except Exception as e:
         logger.error(f"Error fetching contact messages: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch contact messages")
 
+@router.get("/contact/ingest/stats")
+async def get_contact_ingest_stats():
+    """Get write-behind queue depth and flush latency"""
+    return contact_write_buffer.stats()
+
+# Cells starting with these run as formulas in Excel/Sheets (CSV injection)
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _csv_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    value = str(value)
+    if value.startswith(CSV_FORMULA_PREFIXES):
+        # Form input is untrusted; a leading quote makes it plain text
+        return "'" + value
+    return value
+
+def _drain(buffer: io.StringIO, chunk: List[bytes]) -> bytes:
+    data = buffer.getvalue().encode() + b"".join(chunk)
+    buffer.seek(0)
+    buffer.truncate()
+    chunk.clear()
+    return data
+
+async def _export_rows(cursor, export_format: str) -> AsyncIterator[bytes]:
+    """Encode the cursor batch by batch so memory stays flat"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    chunk: List[bytes] = []
+    
+    # Send the headers (and CSV header row) before the first query round trip
+    if export_format == "csv":
+        writer.writerow(EXPORT_FIELDS)
+    yield _drain(buffer, chunk)
+    
+    rows = 0
+    try:
+        async for doc in cursor:
+            if export_format == "csv":
+                writer.writerow([_csv_value(doc.get(field)) for field in EXPORT_FIELDS])
+            else:
+                chunk.append(dumps(doc) + b"\n")
+            rows += 1
+            if rows % EXPORT_BATCH_SIZE == 0:
+                yield _drain(buffer, chunk)
+        yield _drain(buffer, chunk)
+    except Exception as e:
+        # Headers are already sent; all we can do is cut the stream short
+        logger.error(f"Error exporting contact messages after {rows} rows: {str(e)}")
+        raise
+
+@router.get("/contact/messages/export")
+async def export_contact_messages(
+    format: str = Query("ndjson"),
+    status: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None)
+):
+    """Stream every contact message as NDJSON or CSV (admin only)"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+    if status is not None and status not in MESSAGE_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    
+    query = {}
+    if status:
+        query["status"] = status
+    if since or until:
+        query["created_at"] = {}
+        if since:
+            query["created_at"]["$gte"] = since
+        if until:
+            query["created_at"]["$lt"] = until
+    
+    db = get_database()
+    cursor = db.contact_messages.find(query, {"_id": 0, **{field: 1 for field in EXPORT_FIELDS}}).sort(
+        [("created_at", 1), ("id", 1)]
+    ).batch_size(EXPORT_BATCH_SIZE)
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        _export_rows(cursor, format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="contact_messages.{extension}"',
+            "Cache-Control": "private, no-store",
+        }
+    )
+
 @router.get("/contact/messages/{message_id}", response_model=ContactMessage)
 async def get_contact_message(message_id: str):
     """Get a specific contact message"""
@@ -55,39 +201,48 @@ async def get_contact_message(message_id: str):
         logger.error(f"Error fetching contact message: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch contact message")
 
-@router.put("/contact/messages/{message_id}/status")
+@router.put("/contact/messages/{message_id}/status", dependencies=[Depends(limit_writes)])
 async def update_message_status(message_id: str, status: str):
     """Update message status (new, read, replied)"""
     try:
         db = get_database()
         
-        valid_statuses = ["new", "read", "replied"]
-        if status not in valid_statuses:
+        if status not in MESSAGE_STATUSES:
             raise HTTPException(status_code=400, detail="Invalid status")
         
-        result = await db.contact_messages.update_one(
+        previous = await db.contact_messages.find_one_and_update(
             {"id": message_id},
-            {"$set": {"status": status}}
+            {"$set": {"status": status}},
+            projection={"status": 1},
+            return_document=ReturnDocument.BEFORE
         )
         
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(status_code=404, detail="Message not found")
         
+        await contact_counters.transition(db, previous.get("status", "new"), status)
+        await collection_changed(db, "contact_messages")
+        
         return {"message": "Status updated successfully"}
         
     except Exception as e:
         logger.error(f"Error updating message status: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update message status")
 
-@router.delete("/contact/messages/{message_id}")
+@router.delete("/contact/messages/{message_id}", dependencies=[Depends(limit_writes)])
 async def delete_contact_message(message_id: str):
     """Delete a contact message"""
     try:
         db = get_database()
         
-        result = await db.contact_messages.delete_one({"id": message_id})
+        deleted = await db.contact_messages.find_one_and_delete(
+            {"id": message_id},
+            projection={"status": 1}
+        )
         
-        if result.deleted_count == 1:
+        if deleted is not None:
+            await contact_counters.increment(db, deleted.get("status", "new"), -1)
+            await collection_changed(db, "contact_messages")
             return {"message": "Contact message deleted successfully"}
         else:
             raise HTTPException(status_code=404, detail="Message not found")
@@ -102,18 +257,27 @@ async def get_contact_stats():
     try:
         db = get_database()
         
-        total_messages = await db.contact_messages.count_documents({})
-        new_messages = await db.contact_messages.count_documents({"status": "new"})
-        read_messages = await db.contact_messages.count_documents({"status": "read"})
-        replied_messages = await db.contact_messages.count_documents({"status": "replied"})
+        counters = await contact_counters.get_counters(db)
         
         return {
-            "total_messages": total_messages,
-            "new_messages": new_messages,
-            "read_messages": read_messages,
-            "replied_messages": replied_messages
+            "total_messages": counters.get("total", 0),
+            "new_messages": counters.get("new", 0),
+            "read_messages": counters.get("read", 0),
+            "replied_messages": counters.get("replied", 0)
         }
         
     except Exception as e:
         logger.error(f"Error fetching contact stats: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to fetch contact statistics")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to fetch contact statistics")
+
+@router.post("/contact/stats/reconcile", dependencies=[Depends(limit_writes)])
+async def reconcile_contact_stats():
+    """Rebuild contact statistics from the messages collection"""
+    try:
+        db = get_database()
+        counters = await contact_counters.reconcile_counters(db)
+        return {"message": "Contact statistics reconciled", "counters": counters}
+        
+    except Exception as e:
+        logger.error(f"Error reconciling contact stats: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to reconcile contact statistics")
\ No newline at end of file
@@ -1,117 +1,295 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from pymongo import InsertOne, ReplaceOne
+from pymongo.errors import BulkWriteError
 from models import (
     HeroSection, AboutSection, SkillsSection, Project, ProjectCreate,
     Education, EducationCreate, Experience, ExperienceCreate,
-    Achievement, AchievementCreate, ContactInfo, PortfolioData
+    Achievement, AchievementCreate, ContactInfo, PortfolioData,
+    BulkItemResult, BulkWriteSummary
 )
 from database import get_database
+from cache import portfolio_cache, section_caches
+from coherence import cache_coherence
+from prerender import portfolio_prerenderer
+from snapshot import LIST_SECTIONS, SECTIONS, load_sections, load_snapshot, rebuild_snapshot, section_changed
+from http_cache import JSONPayload, cached_json_response, not_modified_response
+from list_versions import list_etag
+from serialization import dumps, trusted_list
+from search import SEARCH_FIELDS, search_index
+from facets import MATCH_MODES, tech_index
+from pagination import PageParams, fetch_page, page_headers, page_params
+from admission import limit_writes
+from fieldsets import projection, sparse_fields
+from revisions import DEFAULT_CHANGES_LIMIT, changes_since, record_deletion, reserve_revisions, stamp_documents
+from datetime import datetime
+from functools import partial
+import asyncio
 import logging
+import os
+import time
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# List collections that accept bulk imports: (input model, stored model)
+BULK_COLLECTIONS = {
+    "projects": (ProjectCreate, Project),
+    "education": (EducationCreate, Education),
+    "experience": (ExperienceCreate, Experience),
+    "achievements": (AchievementCreate, Achievement),
+}
+BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', '10000'))
+
+SECTION_MODELS = {
+    "hero": HeroSection,
+    "about": AboutSection,
+    "skills": SkillsSection,
+    "contact": ContactInfo,
+    "projects": Project,
+    "education": Education,
+    "experience": Experience,
+    "achievements": Achievement,
+}
+
+# Shown until the owner fills in a singleton section
+DEFAULT_SECTIONS = {
+    "hero": {
+        "name": "Your Name Here",
+        "title": "Computer Science Engineering Student",
+        "subtitle": "Full Stack Developer | AI Enthusiast | Problem Solver",
+        "description": "Passionate about creating innovative solutions through code.",
+        "resume_url": "#",
+        "social_links": {
+            "github": "https://github.com/yourusername",
+            "linkedin": "https://linkedin.com/in/yourusername",
+            "twitter": "https://twitter.com/yourusername",
+            "email": "your.email@example.com"
+        }
+    },
+    "about": {
+        "title": "About Me",
+        "description": "I'm a passionate Computer Science Engineering student with a strong foundation in software development.",
+        "highlights": [
+            "🎓 Currently pursuing B.Tech in Computer Science Engineering",
+            "💻 3+ years of programming experience",
+            "🚀 Built 10+ projects using modern technologies"
+        ],
+        "image_url": "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=400&h=400&fit=crop&crop=face"
+    },
+    "skills": {
+        "title": "Technical Skills",
+        "categories": [
+            {
+                "name": "Programming Languages",
+                "skills": ["JavaScript", "Python", "Java", "C++", "TypeScript", "SQL"]
+            },
+            {
+                "name": "Frontend Development",
+                "skills": ["React", "HTML5", "CSS3", "Tailwind CSS", "Bootstrap"]
+            }
+        ]
+    },
+    "contact": {
+        "title": "Get In Touch",
+        "description": "I'm always open to discussing new opportunities.",
+        "email": "your.email@example.com",
+        "phone": "+91 XXXXX XXXXX",
+        "location": "City, State, India",
+        "social_links": {
+            "github": "https://github.com/yourusername",
+            "linkedin": "https://linkedin.com/in/yourusername",
+            "twitter": "https://twitter.com/yourusername",
+            "instagram": "https://instagram.com/yourusername"
+        }
+    },
+}
+
+def _parse_sections(sections: Optional[str] = Query(
+    None, description=f"Comma-separated subset of: {', '.join(SECTIONS)}"
+)) -> Optional[List[str]]:
+    """Dependency for ``?sections=``; None means the whole portfolio"""
+    if sections is None:
+        return None
+    requested = [section.strip() for section in sections.split(",") if section.strip()]
+    unknown = sorted(set(requested) - set(SECTIONS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+    if not requested or set(requested) == set(SECTIONS):
+        return None
+    return list(dict.fromkeys(requested))
+
 @router.get("/portfolio", response_model=PortfolioData)
-async def get_portfolio():
-    """Get complete portfolio data"""
+async def get_portfolio(request: Request, sections: Optional[List[str]] = Depends(_parse_sections)):
+    """Get complete portfolio data, or only some ``sections`` (e.g. hero,about)"""
     try:
-        db = get_database()
-        
-        # Get all portfolio sections
-        hero = await db.hero.find_one()
-        about = await db.about.find_one()
-        skills = await db.skills.find_one()
-        projects = await db.projects.find({"featured": True}).to_list(10)
-        education = await db.education.find().sort("created_at", -1).to_list(10)
-        experience = await db.experience.find().sort("created_at", -1).to_list(10)
-        achievements = await db.achievements.find().sort("created_at", -1).to_list(10)
-        contact = await db.contact.find_one()
-        
-        # Create default data if not exists
-        if not hero:
-            hero = {
-                "name": "Your Name Here",
-                "title": "Computer Science Engineering Student",
-                "subtitle": "Full Stack Developer | AI Enthusiast | Problem Solver",
-                "description": "Passionate about creating innovative solutions through code.",
-                "resume_url": "#",
-                "social_links": {
-                    "github": "https://github.com/yourusername",
-                    "linkedin": "https://linkedin.com/in/yourusername",
-                    "twitter": "https://twitter.com/yourusername",
-                    "email": "your.email@example.com"
-                }
-            }
-        
-        if not about:
-            about = {
-                "title": "About Me",
-                "description": "I'm a passionate Computer Science Engineering student with a strong foundation in software development.",
-                "highlights": [
-                    "🎓 Currently pursuing B.Tech in Computer Science Engineering",
-                    "💻 3+ years of programming experience",
-                    "🚀 Built 10+ projects using modern technologies"
-                ],
-                "image_url": "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=400&h=400&fit=crop&crop=face"
-            }
+        if sections is not None:
+            return cached_json_response(request, await _load_sections(sections))
         
-        if not skills:
-            skills = {
-                "title": "Technical Skills",
-                "categories": [
-                    {
-                        "name": "Programming Languages",
-                        "skills": ["JavaScript", "Python", "Java", "C++", "TypeScript", "SQL"]
-                    },
-                    {
-                        "name": "Frontend Development",
-                        "skills": ["React", "HTML5", "CSS3", "Tailwind CSS", "Bootstrap"]
-                    }
-                ]
-            }
+        # Static-file fast path: pre-compressed render of the current version
+        prerendered = portfolio_prerenderer.response(request)
+        if prerendered is not None:
+            return prerendered
         
-        if not contact:
-            contact = {
-                "title": "Get In Touch",
-                "description": "I'm always open to discussing new opportunities.",
-                "email": "your.email@example.com",
-                "phone": "+91 XXXXX XXXXX",
-                "location": "City, State, India",
-                "social_links": {
-                    "github": "https://github.com/yourusername",
-                    "linkedin": "https://linkedin.com/in/yourusername",
-                    "twitter": "https://twitter.com/yourusername",
-                    "instagram": "https://instagram.com/yourusername"
-                }
-            }
-        
-        return PortfolioData(
-            hero=HeroSection(**hero),
-            about=AboutSection(**about),
-            skills=SkillsSection(**skills),
-            projects=[Project(**project) for project in projects],
-            education=[Education(**edu) for edu in education],
-            experience=[Experience(**exp) for exp in experience],
-            achievements=[Achievement(**ach) for ach in achievements],
-            contact=ContactInfo(**contact)
-        )
+        payload = await portfolio_cache.get_or_load(_load_portfolio_payload)
+        return cached_json_response(request, payload)
         
     except Exception as e:
         logger.error(f"Error fetching portfolio data: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch portfolio data")
 
-@router.put("/portfolio/hero", response_model=HeroSection)
+@router.get("/portfolio/sections/{section}")
+async def get_portfolio_section(request: Request, section: str):
+    """Get one portfolio section, e.g. hero for the first paint"""
+    if section not in SECTIONS:
+        raise HTTPException(status_code=404, detail="Unknown section")
+    
+    try:
+        payload = await section_caches[section].get_or_load(partial(_load_section_payload, section))
+        return cached_json_response(request, payload)
+        
+    except Exception as e:
+        logger.error(f"Error fetching portfolio section {section}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch portfolio section")
+
+@router.get("/portfolio/search")
+async def search_portfolio(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Full-text search over projects, experience and achievements"""
+    if type and any(collection not in SEARCH_FIELDS for collection in type):
+        raise HTTPException(status_code=400, detail=f"type must be one of: {', '.join(SEARCH_FIELDS)}")
+    
+    started = time.perf_counter()
+    results = search_index.search(q, collections=type, limit=limit)
+    took_ms = (time.perf_counter() - started) * 1000
+    
+    return Response(
+        content=dumps({"query": q, "total": len(results), "took_ms": round(took_ms, 3), "results": results}),
+        media_type="application/json"
+    )
+
+@router.get("/portfolio/changes")
+async def get_portfolio_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_CHANGES_LIMIT, ge=1, le=1000)
+):
+    """Entries written or deleted after revision ``since``, oldest first
+
+    Clients keep the returned ``revision`` and pass it as ``since`` next
+    time; ``has_more`` means another call will return further changes.
+    """
+    try:
+        db = get_database()
+        changes = await changes_since(db, since, limit)
+        return Response(content=dumps(changes), media_type="application/json")
+        
+    except Exception as e:
+        logger.error(f"Error fetching portfolio changes: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch portfolio changes")
+
+@router.get("/portfolio/cache/stats")
+async def get_portfolio_cache_stats():
+    """Get portfolio cache hit/miss counters"""
+    return {
+        **portfolio_cache.stats(),
+        "sections": {section: cache.stats()["cached"] for section, cache in section_caches.items()},
+        "prerender": portfolio_prerenderer.stats(),
+        "coherence": cache_coherence.stats()
+    }
+
+async def _section_changed(db, section: str) -> None:
+    """Refresh the materialized snapshot and drop the in-process caches,
+    here and (through the version stamp) on every other worker"""
+    await section_changed(db, section)
+    invalidate_portfolio_caches(section)
+    try:
+        await cache_coherence.publish(db, section)
+    except Exception as e:
+        logger.error(f"Error publishing cache version for {section}: {str(e)}")
+    
+    # Render the new version now rather than on the next page view
+    try:
+        await portfolio_cache.get_or_load(_load_portfolio_payload)
+    except Exception as e:
+        logger.error(f"Error pre-rendering portfolio after {section} change: {str(e)}")
+
+def _stamp(entry, revision: int) -> dict:
+    """Give ``entry`` its reserved revision and a fresh updated_at; returns its dict"""
+    entry.revision = revision
+    entry.updated_at = datetime.utcnow()
+    return entry.dict()
+
+def invalidate_portfolio_caches(section: Optional[str] = None) -> None:
+    """Drop the cached and pre-rendered portfolio payloads, and the cached
+    copy of ``section`` (every section when None)"""
+    portfolio_cache.invalidate()
+    portfolio_prerenderer.invalidate()
+    for name in [section] if section in section_caches else section_caches:
+        section_caches[name].invalidate()
+
+async def _load_portfolio_payload() -> JSONPayload:
+    """Serialize the portfolio once so cache hits skip Pydantic entirely"""
+    generation = portfolio_prerenderer.generation
+    portfolio = await _load_portfolio()
+    payload = JSONPayload.from_body(portfolio.model_dump_json().encode())
+    await portfolio_prerenderer.render(payload, generation)
+    return payload
+
+async def _load_portfolio() -> PortfolioData:
+    """Assemble portfolio data from the database"""
+    db = get_database()
+    
+    # One indexed read of the materialized document; rebuild it when cold
+    snapshot = await load_snapshot(db)
+    if snapshot is None:
+        snapshot = await rebuild_snapshot(db)
+    
+    return PortfolioData(**{section: _section_value(section, snapshot[section]) for section in SECTIONS})
+
+def _section_value(section: str, raw):
+    """Validate one stored section, falling back to the default data"""
+    model = SECTION_MODELS[section]
+    if section in LIST_SECTIONS:
+        return [model(**item) for item in raw or []]
+    # Create default data if not exists
+    return model(**(raw or DEFAULT_SECTIONS[section]))
+
+async def _load_section_payload(section: str) -> JSONPayload:
+    """Serialize one section for GET /portfolio?sections= and /portfolio/sections/{section}"""
+    raw = (await load_sections(get_database(), [section]))[section]
+    value = _section_value(section, raw)
+    if section in LIST_SECTIONS:
+        body = b"[" + b",".join(item.model_dump_json().encode() for item in value) + b"]"
+    else:
+        body = value.model_dump_json().encode()
+    return JSONPayload.from_body(body)
+
+async def _load_sections(sections: List[str]) -> JSONPayload:
+    """Object with the requested sections, each loaded (concurrently) through its cache"""
+    payloads = await asyncio.gather(*(
+        section_caches[section].get_or_load(partial(_load_section_payload, section))
+        for section in sections
+    ))
+    parts = [b'"' + section.encode() + b'":' + payload.body for section, payload in zip(sections, payloads)]
+    return JSONPayload.from_body(b"{" + b",".join(parts) + b"}")
+
+@router.put("/portfolio/hero", response_model=HeroSection, dependencies=[Depends(limit_writes)])
 async def update_hero(hero_data: HeroSection):
     """Update hero section"""
     try:
         db = get_database()
-        hero_dict = hero_data.dict()
-        
-        result = await db.hero.replace_one(
-            {"id": hero_data.id},
-            hero_dict,
-            upsert=True
-        )
+        async with reserve_revisions(db) as revision:
+            hero_dict = _stamp(hero_data, revision)
+            result = await db.hero.replace_one(
+                {"id": hero_data.id},
+                hero_dict,
+                upsert=True
+            )
+        await _section_changed(db, "hero")
         
         if result.acknowledged:
             return hero_data
@@ -122,18 +300,19 @@ async def update_hero(hero_data: HeroSection):
         logger.error(f"Error updating hero section: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update hero section")
 
-@router.put("/portfolio/about", response_model=AboutSection)
+@router.put("/portfolio/about", response_model=AboutSection, dependencies=[Depends(limit_writes)])
 async def update_about(about_data: AboutSection):
     """Update about section"""
     try:
         db = get_database()
-        about_dict = about_data.dict()
-        
-        result = await db.about.replace_one(
-            {"id": about_data.id},
-            about_dict,
-            upsert=True
-        )
+        async with reserve_revisions(db) as revision:
+            about_dict = _stamp(about_data, revision)
+            result = await db.about.replace_one(
+                {"id": about_data.id},
+                about_dict,
+                upsert=True
+            )
+        await _section_changed(db, "about")
         
         if result.acknowledged:
             return about_data
@@ -144,18 +323,19 @@ async def update_about(about_data: AboutSection):
         logger.error(f"Error updating about section: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update about section")
 
-@router.put("/portfolio/skills", response_model=SkillsSection)
+@router.put("/portfolio/skills", response_model=SkillsSection, dependencies=[Depends(limit_writes)])
 async def update_skills(skills_data: SkillsSection):
     """Update skills section"""
     try:
         db = get_database()
-        skills_dict = skills_data.dict()
-        
-        result = await db.skills.replace_one(
-            {"id": skills_data.id},
-            skills_dict,
-            upsert=True
-        )
+        async with reserve_revisions(db) as revision:
+            skills_dict = _stamp(skills_data, revision)
+            result = await db.skills.replace_one(
+                {"id": skills_data.id},
+                skills_dict,
+                upsert=True
+            )
+        await _section_changed(db, "skills")
         
         if result.acknowledged:
             return skills_data
@@ -166,15 +346,18 @@ async def update_skills(skills_data: SkillsSection):
         logger.error(f"Error updating skills section: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update skills section")
 
-@router.post("/portfolio/projects", response_model=Project)
+@router.post("/portfolio/projects", response_model=Project, dependencies=[Depends(limit_writes)])
 async def create_project(project_data: ProjectCreate):
     """Create a new project"""
     try:
         db = get_database()
         project = Project(**project_data.dict())
-        project_dict = project.dict()
-        
-        result = await db.projects.insert_one(project_dict)
+        async with reserve_revisions(db) as revision:
+            project_dict = _stamp(project, revision)
+            result = await db.projects.insert_one(project_dict)
+        await _section_changed(db, "projects")
+        search_index.add("projects", project_dict)
+        tech_index.add(project_dict)
         
         if result.acknowledged:
             return project
@@ -186,18 +369,53 @@ async def create_project(project_data: ProjectCreate):
         raise HTTPException(status_code=500, detail="Failed to create project")
 
 @router.get("/portfolio/projects", response_model=List[Project])
-async def get_projects():
-    """Get all projects"""
+async def get_projects(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    tech: Optional[List[str]] = Query(None),
+    match: str = Query("all"),
+    facets: bool = Query(False),
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(Project))
+):
+    """Get all projects, optionally filtered by technology
+
+    ``tech`` is case-insensitive and may repeat; ``match`` decides whether a
+    project needs all or any of them. With ``facets=true`` the response is
+    ``{"projects": [...], "total": n, "facets": {technology: count}}``.
+    ``fields`` limits each project to the listed fields.
+    """
+    if match not in MATCH_MODES:
+        raise HTTPException(status_code=400, detail="match must be 'all' or 'any'")
+    
     try:
         db = get_database()
-        projects = await db.projects.find().sort("created_at", -1).to_list(100)
-        return [Project(**project) for project in projects]
+        etag = await list_etag(db, "projects", request)
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        
+        query = tech_index.mongo_filter(tech, match) if tech else None
+        projects, next_cursor = await fetch_page(db.projects, page, query=query, projection=projection(fields))
+        
+        if facets:
+            matched = tech_index.match(tech, match) if tech else None
+            body = dumps({
+                "projects": trusted_list(Project, projects, fields),
+                "total": len(matched) if matched is not None else len(tech_index),
+                "facets": tech_index.counts(matched)
+            })
+        else:
+            body = dumps(trusted_list(Project, projects, fields))
+        return cached_json_response(
+            request, JSONPayload(body, etag),
+            extra_headers=page_headers(request, next_cursor)
+        )
         
     except Exception as e:
         logger.error(f"Error fetching projects: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch projects")
 
-@router.put("/portfolio/projects/{project_id}", response_model=Project)
+@router.put("/portfolio/projects/{project_id}", response_model=Project, dependencies=[Depends(limit_writes)])
 async def update_project(project_id: str, project_data: ProjectCreate):
     """Update a project"""
     try:
@@ -208,12 +426,15 @@ async def update_project(project_id: str, project_data: ProjectCreate):
             raise HTTPException(status_code=404, detail="Project not found")
         
         updated_project = Project(id=project_id, **project_data.dict())
-        project_dict = updated_project.dict()
-        
-        result = await db.projects.replace_one(
-            {"id": project_id},
-            project_dict
-        )
+        async with reserve_revisions(db) as revision:
+            project_dict = _stamp(updated_project, revision)
+            result = await db.projects.replace_one(
+                {"id": project_id},
+                project_dict
+            )
+        await _section_changed(db, "projects")
+        search_index.add("projects", project_dict)
+        tech_index.add(project_dict)
         
         if result.acknowledged:
             return updated_project
@@ -224,13 +445,18 @@ async def update_project(project_id: str, project_data: ProjectCreate):
         logger.error(f"Error updating project: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update project")
 
-@router.delete("/portfolio/projects/{project_id}")
+@router.delete("/portfolio/projects/{project_id}", dependencies=[Depends(limit_writes)])
 async def delete_project(project_id: str):
     """Delete a project"""
     try:
         db = get_database()
         
         result = await db.projects.delete_one({"id": project_id})
+        if result.deleted_count == 1:
+            await record_deletion(db, "projects", project_id)
+        await _section_changed(db, "projects")
+        search_index.remove("projects", project_id)
+        tech_index.remove(project_id)
         
         if result.deleted_count == 1:
             return {"message": "Project deleted successfully"}
@@ -241,15 +467,16 @@ async def delete_project(project_id: str):
         logger.error(f"Error deleting project: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to delete project")
 
-@router.post("/portfolio/education", response_model=Education)
+@router.post("/portfolio/education", response_model=Education, dependencies=[Depends(limit_writes)])
 async def create_education(education_data: EducationCreate):
     """Create education entry"""
     try:
         db = get_database()
         education = Education(**education_data.dict())
-        education_dict = education.dict()
-        
-        result = await db.education.insert_one(education_dict)
+        async with reserve_revisions(db) as revision:
+            education_dict = _stamp(education, revision)
+            result = await db.education.insert_one(education_dict)
+        await _section_changed(db, "education")
         
         if result.acknowledged:
             return education
@@ -261,26 +488,41 @@ async def create_education(education_data: EducationCreate):
         raise HTTPException(status_code=500, detail="Failed to create education entry")
 
 @router.get("/portfolio/education", response_model=List[Education])
-async def get_education():
+async def get_education(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(Education))
+):
     """Get all education entries"""
     try:
         db = get_database()
-        education = await db.education.find().sort("created_at", -1).to_list(100)
-        return [Education(**edu) for edu in education]
+        etag = await list_etag(db, "education", request)
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        
+        education, next_cursor = await fetch_page(db.education, page, projection=projection(fields))
+        body = dumps(trusted_list(Education, education, fields))
+        return cached_json_response(
+            request, JSONPayload(body, etag),
+            extra_headers=page_headers(request, next_cursor)
+        )
         
     except Exception as e:
         logger.error(f"Error fetching education: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch education")
 
-@router.post("/portfolio/experience", response_model=Experience)
+@router.post("/portfolio/experience", response_model=Experience, dependencies=[Depends(limit_writes)])
 async def create_experience(experience_data: ExperienceCreate):
     """Create experience entry"""
     try:
         db = get_database()
         experience = Experience(**experience_data.dict())
-        experience_dict = experience.dict()
-        
-        result = await db.experience.insert_one(experience_dict)
+        async with reserve_revisions(db) as revision:
+            experience_dict = _stamp(experience, revision)
+            result = await db.experience.insert_one(experience_dict)
+        await _section_changed(db, "experience")
+        search_index.add("experience", experience_dict)
         
         if result.acknowledged:
             return experience
@@ -292,26 +534,41 @@ async def create_experience(experience_data: ExperienceCreate):
         raise HTTPException(status_code=500, detail="Failed to create experience entry")
 
 @router.get("/portfolio/experience", response_model=List[Experience])
-async def get_experience():
+async def get_experience(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(Experience))
+):
     """Get all experience entries"""
     try:
         db = get_database()
-        experience = await db.experience.find().sort("created_at", -1).to_list(100)
-        return [Experience(**exp) for exp in experience]
+        etag = await list_etag(db, "experience", request)
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        
+        experience, next_cursor = await fetch_page(db.experience, page, projection=projection(fields))
+        body = dumps(trusted_list(Experience, experience, fields))
+        return cached_json_response(
+            request, JSONPayload(body, etag),
+            extra_headers=page_headers(request, next_cursor)
+        )
         
     except Exception as e:
         logger.error(f"Error fetching experience: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch experience")
 
-@router.post("/portfolio/achievements", response_model=Achievement)
+@router.post("/portfolio/achievements", response_model=Achievement, dependencies=[Depends(limit_writes)])
 async def create_achievement(achievement_data: AchievementCreate):
     """Create achievement entry"""
     try:
         db = get_database()
         achievement = Achievement(**achievement_data.dict())
-        achievement_dict = achievement.dict()
-        
-        result = await db.achievements.insert_one(achievement_dict)
+        async with reserve_revisions(db) as revision:
+            achievement_dict = _stamp(achievement, revision)
+            result = await db.achievements.insert_one(achievement_dict)
+        await _section_changed(db, "achievements")
+        search_index.add("achievements", achievement_dict)
         
         if result.acknowledged:
             return achievement
@@ -323,29 +580,43 @@ async def create_achievement(achievement_data: AchievementCreate):
         raise HTTPException(status_code=500, detail="Failed to create achievement entry")
 
 @router.get("/portfolio/achievements", response_model=List[Achievement])
-async def get_achievements():
+async def get_achievements(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(Achievement))
+):
     """Get all achievements"""
     try:
         db = get_database()
-        achievements = await db.achievements.find().sort("created_at", -1).to_list(100)
-        return [Achievement(**ach) for ach in achievements]
+        etag = await list_etag(db, "achievements", request)
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        
+        achievements, next_cursor = await fetch_page(db.achievements, page, projection=projection(fields))
+        body = dumps(trusted_list(Achievement, achievements, fields))
+        return cached_json_response(
+            request, JSONPayload(body, etag),
+            extra_headers=page_headers(request, next_cursor)
+        )
         
     except Exception as e:
         logger.error(f"Error fetching achievements: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch achievements")
 
-@router.put("/portfolio/contact", response_model=ContactInfo)
+@router.put("/portfolio/contact", response_model=ContactInfo, dependencies=[Depends(limit_writes)])
 async def update_contact(contact_data: ContactInfo):
     """Update contact information"""
     try:
         db = get_database()
-        contact_dict = contact_data.dict()
-        
-        result = await db.contact.replace_one(
-            {"id": contact_data.id},
-            contact_dict,
-            upsert=True
-        )
+        async with reserve_revisions(db) as revision:
+            contact_dict = _stamp(contact_data, revision)
+            result = await db.contact.replace_one(
+                {"id": contact_data.id},
+                contact_dict,
+                upsert=True
+            )
+        await _section_changed(db, "contact")
         
         if result.acknowledged:
             return contact_data
@@ -354,4 +625,96 @@ async def update_contact(contact_data: ContactInfo):
             
     except Exception as e:
         logger.error(f"Error updating contact information: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to update contact information")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to update contact information")
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'item'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+@router.post(
+    "/portfolio/{collection}/bulk",
+    response_model=BulkWriteSummary,
+    dependencies=[Depends(limit_writes)]
+)
+async def bulk_write_entries(collection: str, items: List[Dict[str, Any]] = Body(...)):
+    """Create or upsert many list entries with a single bulk_write
+
+    Items carrying an ``id`` replace (or create) that entry; items without
+    one are inserted. Invalid items are reported without failing the rest.
+    """
+    if collection not in BULK_COLLECTIONS:
+        raise HTTPException(status_code=404, detail="Unknown collection")
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ITEMS} items per request")
+    
+    create_model, model = BULK_COLLECTIONS[collection]
+    
+    try:
+        db = get_database()
+        results = [BulkItemResult(index=index, status="error") for index in range(len(items))]
+        op_docs = []
+        op_items = []
+        
+        # Validate the whole batch first; only valid items become operations
+        for index, item in enumerate(items):
+            try:
+                data = create_model.model_validate(item)
+                item_id = item.get("id")
+                if item_id is not None and not isinstance(item_id, str):
+                    raise ValueError("id must be a string")
+            except ValidationError as e:
+                results[index].error = _validation_message(e)
+                continue
+            except ValueError as e:
+                results[index].error = str(e)
+                continue
+            
+            entry = model(id=item_id, **data.dict()) if item_id else model(**data.dict())
+            op_docs.append(entry.dict())
+            results[index].id = entry.id
+            op_items.append(index)
+        
+        operations = [
+            ReplaceOne({"id": doc["id"]}, doc, upsert=True) if items[index].get("id") else InsertOne(doc)
+            for doc, index in zip(op_docs, op_items)
+        ]
+        
+        write_errors = {}
+        upserted = set()
+        if operations:
+            # The whole block of revisions stays pending until bulk_write returns
+            async with reserve_revisions(db, len(op_docs)) as first_revision:
+                stamp_documents(op_docs, first_revision)
+                try:
+                    result = await db[collection].bulk_write(operations, ordered=False)
+                    upserted = set(result.upserted_ids)
+                except BulkWriteError as e:
+                    upserted = {item["index"] for item in e.details.get("upserted", [])}
+                    for error in e.details.get("writeErrors", []):
+                        write_errors[error["index"]] = error.get("errmsg", "write error")
+            await _section_changed(db, collection)
+        
+        for op_index, index in enumerate(op_items):
+            if op_index in write_errors:
+                results[index].error = write_errors[op_index]
+                continue
+            if isinstance(operations[op_index], InsertOne) or op_index in upserted:
+                results[index].status = "created"
+            else:
+                results[index].status = "updated"
+            search_index.add(collection, op_docs[op_index])
+            if collection == "projects":
+                tech_index.add(op_docs[op_index])
+        
+        return BulkWriteSummary(
+            created=sum(1 for r in results if r.status == "created"),
+            updated=sum(1 for r in results if r.status == "updated"),
+            failed=sum(1 for r in results if r.status == "error"),
+            results=results
+        )
+        
+    except Exception as e:
+        logger.error(f"Error bulk writing {collection}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to bulk write {collection}")
\ No newline at end of file
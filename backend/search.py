@@ -0,0 +1,164 @@
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+import logging
+import math
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Searchable fields per collection and how much a match in each counts
+SEARCH_FIELDS = {
+    "projects": {"title": 3, "technologies": 2, "description": 1},
+    "experience": {"position": 3, "company": 2, "description": 1, "achievements": 1},
+    "achievements": {"title": 3, "description": 1},
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+PREFIX_WEIGHT = 0.6
+MIN_PREFIX_LENGTH = 2
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+DocKey = Tuple[str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; keeps names like c++ and c# intact"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _field_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value if item is not None)
+    return str(value)
+
+
+class SearchIndex:
+    """In-process inverted index with prefix matching and BM25 ranking"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[DocKey, float]] = defaultdict(dict)
+        self._doc_terms: Dict[DocKey, Dict[str, float]] = {}
+        self._doc_lengths: Dict[DocKey, float] = {}
+        self._documents: Dict[DocKey, dict] = {}
+        self._total_length = 0.0
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, collection: str, doc: dict) -> None:
+        """Index (or re-index) one document; other collections are ignored"""
+        if collection not in SEARCH_FIELDS:
+            return
+        key = (collection, doc["id"])
+        self.remove(collection, doc["id"])
+
+        terms: Counter = Counter()
+        for field, weight in SEARCH_FIELDS[collection].items():
+            for token in tokenize(_field_text(doc.get(field))):
+                terms[token] += weight
+        length = float(sum(terms.values()))
+
+        for term, frequency in terms.items():
+            if term not in self._postings:
+                self._vocabulary_dirty = True
+            self._postings[term][key] = frequency
+        self._doc_terms[key] = dict(terms)
+        self._doc_lengths[key] = length
+        self._documents[key] = {k: v for k, v in doc.items() if k != "_id"}
+        self._total_length += length
+
+    def remove(self, collection: str, doc_id: str) -> None:
+        """Drop one document from the index if present"""
+        key = (collection, doc_id)
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary_dirty = True
+        self._total_length -= self._doc_lengths.pop(key)
+        self._documents.pop(key, None)
+
+    async def rebuild(self, db) -> int:
+        """Rebuild the whole index from MongoDB"""
+        started = time.perf_counter()
+        # Build off to the side so searches keep working until the swap
+        fresh = SearchIndex()
+        for collection in SEARCH_FIELDS:
+            async for doc in db[collection].find({}, {"_id": 0}):
+                fresh.add(collection, doc)
+        self.__dict__.update(fresh.__dict__)
+        logger.info(f"Search index rebuilt: {len(self)} documents in "
+                    f"{(time.perf_counter() - started) * 1000:.1f}ms")
+        return len(self)
+
+    async def reload(self, db, collection: str) -> None:
+        """Re-read one collection, e.g. after another worker changed it"""
+        docs = await db[collection].find({}, {"_id": 0}).to_list(None)
+        for key in [key for key in self._documents if key[0] == collection]:
+            self.remove(*key)
+        for doc in docs:
+            self.add(collection, doc)
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Exact term plus vocabulary terms starting with ``token``"""
+        matches = [(token, 1.0)] if token in self._postings else []
+        if len(token) < MIN_PREFIX_LENGTH:
+            return matches
+
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect_left(self._vocabulary, token)
+        for term in self._vocabulary[start:]:
+            if not term.startswith(token):
+                break
+            if term != token:
+                matches.append((term, PREFIX_WEIGHT))
+        return matches
+
+    def search(self, query: str, collections: Optional[List[str]] = None, limit: int = 20) -> List[dict]:
+        """Rank documents for ``query``; every token may match as a prefix"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self._documents:
+            return []
+
+        total_docs = len(self._documents)
+        avg_length = self._total_length / total_docs or 1.0
+        scores: Dict[DocKey, float] = defaultdict(float)
+
+        for token in tokens:
+            # A document scores a query token once, via its best matching term
+            best: Dict[DocKey, float] = {}
+            for term, weight in self._expand(token):
+                postings = self._postings[term]
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    if collections and key[0] not in collections:
+                        continue
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[key] / avg_length)
+                    score = weight * idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                    if score > best.get(key, 0.0):
+                        best[key] = score
+            for key, score in best.items():
+                scores[key] += score
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            {"type": collection, "score": round(score, 4), "item": self._documents[(collection, doc_id)]}
+            for (collection, doc_id), score in ranked
+        ]
+
+
+search_index = SearchIndex()
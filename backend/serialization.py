@@ -0,0 +1,35 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+from pydantic import BaseModel
+import orjson
+
+
+@lru_cache(maxsize=None)
+def _model_layout(model: Type[BaseModel]) -> Tuple[Tuple[str, ...], Dict[str, Any]]:
+    """Field names and static defaults of a model, computed once"""
+    defaults = {
+        name: field.default
+        for name, field in model.model_fields.items()
+        if not field.is_required() and field.default_factory is None
+    }
+    return tuple(model.model_fields), defaults
+
+
+def trusted_document(model: Type[BaseModel], doc: dict, fields: Optional[Sequence[str]] = None) -> dict:
+    """Shape a document we wrote ourselves like ``model`` without validating it
+
+    Only for flat models read back from MongoDB: fields are taken as
+    stored, missing optional fields get their defaults and extra keys
+    (``_id``) are dropped. ``fields`` trims the result to a sparse fieldset.
+    """
+    names, defaults = _model_layout(model)
+    return {name: doc[name] if name in doc else defaults.get(name) for name in fields or names}
+
+
+def trusted_list(model: Type[BaseModel], docs: List[dict], fields: Optional[Sequence[str]] = None) -> List[dict]:
+    return [trusted_document(model, doc, fields) for doc in docs]
+
+
+def dumps(value: Any) -> bytes:
+    """Encode to JSON bytes; datetimes come out in the same ISO format as Pydantic"""
+    return orjson.dumps(value)
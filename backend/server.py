@@ -1,8 +1,8 @@
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Depends, Response
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
@@ -11,18 +11,27 @@ import uuid
 from datetime import datetime
 
 # Import routes
-from routes.portfolio import router as portfolio_router
+from routes.portfolio import router as portfolio_router, invalidate_portfolio_caches
 from routes.contact import router as contact_router
-from database import init_database, close_database
+from database import init_database, close_database, get_database, get_pool_stats, verify_indexes
+from contact_counters import run_reconciler, RECONCILE_INTERVAL
+from contact_buffer import contact_write_buffer
+from cache import portfolio_cache
+from search import SEARCH_FIELDS, search_index
+from facets import tech_index
+from coherence import cache_coherence
+from snapshot import SECTIONS
+from metrics import MetricsMiddleware, metrics_registry
+from compression import CompressionMiddleware, compressed_body_cache
+import admission
+import status_rollups
+import revisions
+from jobs import JOBS_ENABLED, job_queue
+from serialization import dumps, trusted_list
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
 # Create the main app without a prefix
 app = FastAPI(
     title="Portfolio API",
@@ -47,17 +56,59 @@ class StatusCheckCreate(BaseModel):
 async def root():
     return {"message": "Portfolio API is running!", "version": "1.0.0"}
 
-@api_router.post("/status", response_model=StatusCheck)
+@api_router.post("/status", response_model=StatusCheck, dependencies=[Depends(admission.limit_writes)])
 async def create_status_check(input: StatusCheckCreate):
     status_dict = input.dict()
     status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
+    db = get_database()
+    # Raw rows expire through the TTL index; the rollups keep the counts
+    await asyncio.gather(
+        db.status_checks.insert_one(status_obj.dict()),
+        status_rollups.record(db, status_obj.client_name, status_obj.timestamp)
+    )
     return status_obj
 
 @api_router.get("/status", response_model=List[StatusCheck])
 async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+    db = get_database()
+    status_checks = await db.status_checks.find({}, {"_id": 0}).sort("timestamp", -1).to_list(1000)
+    return Response(dumps(trusted_list(StatusCheck, status_checks)), media_type="application/json")
+
+@api_router.get("/status/summary")
+async def get_status_summary(window: str = "1h"):
+    """Status check counts per client over a window such as 15m, 6h or 7d"""
+    span = status_rollups.parse_window(window)
+    summary = await status_rollups.summarize(get_database(), span)
+    return {"window": window, **summary}
+
+@api_router.get("/db/pool")
+async def get_db_pool_stats():
+    """MongoDB connection pool statistics"""
+    return get_pool_stats()
+
+@api_router.get("/db/indexes")
+async def get_db_index_report():
+    """Missing, TTL-mismatched, redundant and unregistered MongoDB indexes"""
+    return await verify_indexes()
+
+@api_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus metrics: per-route latency, Mongo command timing, pools and caches"""
+    body = metrics_registry.render({
+        "mongo_pool": get_pool_stats(),
+        "portfolio_cache": portfolio_cache.stats(),
+        "contact_buffer": contact_write_buffer.stats(),
+        "cache_coherence": {"remote_changes": cache_coherence.remote_changes},
+        "compression_cache": compressed_body_cache.stats(),
+        **{f"admission_{name}": values for name, values in admission.stats().items()},
+        "jobs": job_queue.stats(),
+    })
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+@api_router.get("/jobs/stats")
+async def get_job_stats():
+    """Background job queue: this worker's counters and jobs by status"""
+    return {**job_queue.stats(), "jobs": await job_queue.counts(get_database())}
 
 # Include portfolio and contact routes
 api_router.include_router(portfolio_router, tags=["Portfolio"])
@@ -72,8 +123,14 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Link", "Retry-After", "X-Next-Cursor"],
 )
 
+app.add_middleware(CompressionMiddleware)
+
+# Outermost middleware, so latency covers everything below it
+app.add_middleware(MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -85,11 +142,44 @@ logger = logging.getLogger(__name__)
 async def startup_event():
     """Initialize database on startup"""
     await init_database()
+    if RECONCILE_INTERVAL > 0:
+        app.state.counters_reconciler = asyncio.create_task(run_reconciler(get_database()))
+    contact_write_buffer.start(get_database())
+    if JOBS_ENABLED:
+        job_queue.start(get_database())
+    
+    # Follow other workers' writes; started before the indexes are built so
+    # nothing committed in between is missed
+    db = get_database()
+    cache_coherence.subscribe(SECTIONS, invalidate_portfolio_caches)
+    cache_coherence.subscribe(SEARCH_FIELDS, lambda section: search_index.reload(db, section))
+    cache_coherence.subscribe(["projects"], lambda section: tech_index.rebuild(db))
+    try:
+        await cache_coherence.start(db)
+    except Exception as e:
+        logger.error(f"Error starting cache coherence: {str(e)}")
+    
+    try:
+        await revisions.backfill(db)
+    except Exception as e:
+        logger.error(f"Error backfilling portfolio revisions: {str(e)}")
+    
+    try:
+        await search_index.rebuild(db)
+        await tech_index.rebuild(db)
+    except Exception as e:
+        logger.error(f"Error building search indexes: {str(e)}")
     logger.info("Portfolio API started successfully")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Close database connection on shutdown"""
+    reconciler = getattr(app.state, "counters_reconciler", None)
+    if reconciler is not None:
+        reconciler.cancel()
+    await cache_coherence.stop()
+    # Drain buffered contact messages before the connection goes away
+    await contact_write_buffer.stop()
+    await job_queue.stop()
     await close_database()
-    client.close()
     logger.info("Portfolio API shutdown complete")
\ No newline at end of file
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from pymongo import UpdateOne
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ID = "portfolio"
+
+# Sections stored as a single document vs. capped, sorted lists
+SINGLETON_SECTIONS = ("hero", "about", "skills", "contact")
+LIST_SECTIONS = ("projects", "education", "experience", "achievements")
+SECTIONS = SINGLETON_SECTIONS + LIST_SECTIONS
+
+LIST_SECTION_LIMIT = 10
+# Sections not re-read for this long are refreshed on the next load, which
+# eventually picks up writes that bypassed the API. Kept well above
+# PORTFOLIO_CACHE_TTL so an ordinary cache expiry stays one indexed read.
+SNAPSHOT_MAX_AGE = float(os.environ.get('SNAPSHOT_MAX_AGE', '3600'))
+
+
+async def fetch_section(db, section: str):
+    """Read one portfolio section from its source collection"""
+    if section in SINGLETON_SECTIONS:
+        return await db[section].find_one({}, {"_id": 0})
+
+    if section == "projects":
+        cursor = db.projects.find({"featured": True}, {"_id": 0}).sort("created_at", -1)
+    else:
+        cursor = db[section].find({}, {"_id": 0}).sort("created_at", -1)
+    return await cursor.to_list(LIST_SECTION_LIMIT)
+
+
+def _stale_sections(snapshot: dict, sections: Iterable[str]) -> list:
+    """Sections missing from ``snapshot`` or read longer ago than the max age"""
+    read_at = snapshot.get("read_at") or {}
+    oldest = datetime.utcnow() - timedelta(seconds=SNAPSHOT_MAX_AGE)
+    return [
+        section for section in sections
+        if section not in snapshot or read_at.get(section) is None or read_at[section] < oldest
+    ]
+
+
+async def load_snapshot(db) -> Optional[dict]:
+    """Get the materialized portfolio document, re-reading only the sections
+    that are missing or stale; None when there is no snapshot yet"""
+    snapshot = await db.portfolio_snapshot.find_one({"_id": SNAPSHOT_ID})
+    if not snapshot:
+        return None
+    stale = _stale_sections(snapshot, SECTIONS)
+    if stale:
+        snapshot.update(await refresh_sections(db, stale))
+    return snapshot
+
+
+async def refresh_sections(db, sections: Iterable[str]) -> dict:
+    """Re-read the given sections and write them into the snapshot
+
+    A read that started later has seen every write an earlier one saw, so
+    a section is only overwritten by a read newer than the stored one;
+    concurrent writers can't leave an older copy behind.
+    """
+    sections = list(sections)
+    read_at = datetime.utcnow()
+    values = await asyncio.gather(*(fetch_section(db, section) for section in sections))
+    update = dict(zip(sections, values))
+
+    await db.portfolio_snapshot.bulk_write([
+        UpdateOne({"_id": SNAPSHOT_ID}, {"$set": {"updated_at": datetime.utcnow()}}, upsert=True),
+        *(
+            UpdateOne(
+                {"_id": SNAPSHOT_ID, f"read_at.{section}": {"$not": {"$gte": read_at}}},
+                {"$set": {section: value, f"read_at.{section}": read_at}}
+            )
+            for section, value in update.items()
+        )
+    ])
+    update["updated_at"] = read_at
+    return update
+
+
+async def load_sections(db, sections: Iterable[str]) -> dict:
+    """Read some sections from the snapshot, refreshing missing or stale ones"""
+    sections = list(sections)
+    snapshot = await db.portfolio_snapshot.find_one(
+        {"_id": SNAPSHOT_ID}, {"_id": 0, "read_at": 1, **{section: 1 for section in sections}}
+    ) or {}
+    stale = _stale_sections(snapshot, sections)
+    if stale:
+        snapshot.update(await refresh_sections(db, stale))
+    return {section: snapshot[section] for section in sections}
+
+
+async def rebuild_snapshot(db) -> dict:
+    """Rebuild the whole snapshot from the source collections"""
+    return await refresh_sections(db, SECTIONS)
+
+
+async def section_changed(db, section: str) -> None:
+    """Bring the snapshot up to date after a writer commits to ``section``"""
+    try:
+        await refresh_sections(db, [section])
+    except Exception as e:
+        logger.error(f"Error refreshing portfolio snapshot ({section}): {str(e)}")
+        # Drop the snapshot so readers fall back to a full rebuild
+        try:
+            await db.portfolio_snapshot.delete_one({"_id": SNAPSHOT_ID})
+        except Exception as e:
+            logger.error(f"Error dropping portfolio snapshot: {str(e)}")
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from pymongo import UpdateOne
+import os
+import re
+
+# Bucket size and how long buckets of that size are kept
+GRANULARITIES = {
+    "minute": (timedelta(minutes=1), timedelta(hours=int(os.environ.get('STATUS_MINUTE_ROLLUP_RETENTION_HOURS', '48')))),
+    "hour": (timedelta(hours=1), timedelta(days=int(os.environ.get('STATUS_HOUR_ROLLUP_RETENTION_DAYS', '90')))),
+}
+# Windows up to this long are answered from minute buckets
+MINUTE_WINDOW_LIMIT = timedelta(hours=6)
+
+_WINDOW_RE = re.compile(r"^(\d+)([mhd])$")
+_WINDOW_UNITS = {"m": "minutes", "h": "hours", "d": "days"}
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    if granularity == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+async def record(db, client_name: str, timestamp: datetime) -> None:
+    """Count one status check in its minute and hour buckets"""
+    operations = []
+    for granularity, (_, retention) in GRANULARITIES.items():
+        bucket = bucket_start(timestamp, granularity)
+        operations.append(UpdateOne(
+            {"granularity": granularity, "bucket": bucket, "client_name": client_name},
+            {
+                "$inc": {"count": 1},
+                "$max": {"last_seen": timestamp},
+                "$setOnInsert": {"expires_at": bucket + retention},
+            },
+            upsert=True
+        ))
+    await db.status_rollups.bulk_write(operations, ordered=False)
+
+
+def parse_window(window: str) -> timedelta:
+    """'15m', '6h', '7d' -> timedelta; 400 for anything else or too long"""
+    match = _WINDOW_RE.match(window.strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise HTTPException(status_code=400, detail="window must look like 15m, 6h or 7d")
+    span = timedelta(**{_WINDOW_UNITS[match.group(2)]: int(match.group(1))})
+    if span > GRANULARITIES["hour"][1]:
+        raise HTTPException(status_code=400, detail="window is longer than the rollup retention")
+    return span
+
+
+async def summarize(db, span: timedelta) -> dict:
+    """Status check counts per client and per bucket over the last ``span``"""
+    granularity = "minute" if span <= MINUTE_WINDOW_LIMIT else "hour"
+    now = datetime.utcnow()
+    since = bucket_start(now - span, granularity)
+
+    clients = {}
+    series = {}
+    cursor = db.status_rollups.find(
+        {"granularity": granularity, "bucket": {"$gte": since}},
+        {"_id": 0, "bucket": 1, "client_name": 1, "count": 1, "last_seen": 1}
+    )
+    async for row in cursor:
+        client = clients.setdefault(row["client_name"], {"client_name": row["client_name"], "count": 0, "last_seen": None})
+        client["count"] += row["count"]
+        if client["last_seen"] is None or row["last_seen"] > client["last_seen"]:
+            client["last_seen"] = row["last_seen"]
+        series[row["bucket"]] = series.get(row["bucket"], 0) + row["count"]
+
+    return {
+        "granularity": granularity,
+        "since": since,
+        "until": now,
+        "total": sum(series.values()),
+        "clients": sorted(clients.values(), key=lambda client: -client["count"]),
+        "series": [{"bucket": bucket, "count": count} for bucket, count in sorted(series.items())],
+    }
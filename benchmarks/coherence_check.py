@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Multi-Worker Cache Coherence Check
+Starts several uvicorn workers against the same MongoDB (MONGO_URL, e.g. a
+local mongod), writes through one of them and measures how long the other
+workers keep serving the old portfolio and search results
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+
+def start_workers(count, base_port, env):
+    workers = []
+    for index in range(count):
+        port = base_port + index
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=env,
+        )
+        workers.append((f"http://127.0.0.1:{port}", process))
+    return workers
+
+
+def wait_ready(url, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/api/", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Worker at {url} did not start")
+
+
+def wait_until(check, timeout):
+    """Seconds until ``check()`` is true, or None on timeout"""
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        if check():
+            return round(time.monotonic() - started, 3)
+        time.sleep(0.02)
+    return None
+
+
+def main(args):
+    env = dict(os.environ)
+    env["CACHE_COHERENCE_MODE"] = args.mode
+    env["CACHE_COHERENCE_POLL_INTERVAL"] = str(args.poll_interval)
+    env["PORTFOLIO_CACHE_TTL"] = "3600"  # only coherence may refresh the caches
+
+    workers = start_workers(args.workers, args.base_port, env)
+    try:
+        for url, _ in workers:
+            wait_ready(url, 30)
+        writer, readers = workers[0][0], [url for url, _ in workers[1:]]
+
+        # Warm every reader's in-process cache before the write
+        for url in readers:
+            httpx.get(f"{url}/api/portfolio").raise_for_status()
+
+        marker = f"Coherence {uuid.uuid4().hex[:8]}"
+        hero = httpx.get(f"{writer}/api/portfolio").json()["hero"]
+        hero["name"] = marker
+        httpx.put(f"{writer}/api/portfolio/hero", json=hero).raise_for_status()
+
+        term = f"zq{uuid.uuid4().hex[:10]}"
+        project = httpx.post(f"{writer}/api/portfolio/projects", json={
+            "title": f"Coherence probe {term}",
+            "description": "Created by benchmarks/coherence_check.py",
+            "technologies": ["Coherence"],
+        }).json()
+
+        report = {"mode": args.mode, "poll_interval_s": args.poll_interval, "workers": args.workers, "readers": {}}
+        for url in readers:
+            report["readers"][url] = {
+                "portfolio_s": wait_until(
+                    lambda: httpx.get(f"{url}/api/portfolio").json()["hero"]["name"] == marker, args.timeout),
+                "search_s": wait_until(
+                    lambda: httpx.get(f"{url}/api/portfolio/search", params={"q": term}).json()["total"] > 0,
+                    args.timeout),
+                "coherence": httpx.get(f"{url}/api/portfolio/cache/stats").json()["coherence"],
+            }
+
+        httpx.delete(f"{writer}/api/portfolio/projects/{project['id']}")
+        print(json.dumps(report, indent=2))
+        stale = [url for url, result in report["readers"].items()
+                 if result["portfolio_s"] is None or result["search_s"] is None]
+        return 1 if stale else 0
+    finally:
+        for _, process in workers:
+            process.terminate()
+        for _, process in workers:
+            process.wait(timeout=10)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--base-port", type=int, default=8101)
+    parser.add_argument("--mode", choices=["auto", "poll"], default="auto")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds before a reader counts as stale")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Concurrent Load Test for the Portfolio API
+Drives scenario mixes with N concurrent clients for a fixed duration and
+reports throughput and latency percentiles as JSON
+
+Targets:
+  --target inprocess       the ASGI app in this process (needs MONGO_URL,
+                           e.g. a local mongod; no network besides that).
+                           Every request comes from one client IP, so the
+                           per-IP contact rate limit is off unless
+                           RATE_LIMIT_ENABLED is set explicitly
+  --target http://host:port  a running server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+
+# Scenarios ---------------------------------------------------------------
+
+class Client:
+    """Per-worker state shared by the scenario steps"""
+
+    def __init__(self, http):
+        self.http = http
+        self.etags = {}
+        self.cursor = None
+
+
+async def homepage(client):
+    # Returning visitors revalidate with the ETag they already have
+    headers = {}
+    if client.etags.get("portfolio") and random.random() < 0.5:
+        headers["If-None-Match"] = client.etags["portfolio"]
+    response = await client.http.get("/api/portfolio", headers=headers)
+    if "etag" in response.headers:
+        client.etags["portfolio"] = response.headers["etag"]
+    return "GET /api/portfolio", response
+
+
+async def project_list(client):
+    response = await client.http.get("/api/portfolio/projects")
+    return "GET /api/portfolio/projects", response
+
+
+async def contact_submit(client):
+    token = uuid.uuid4().hex[:8]
+    response = await client.http.post("/api/contact/messages", json={
+        "name": f"Load Test {token}",
+        "email": f"load-{token}@example.com",
+        "subject": "Load test message",
+        "message": "Generated by benchmarks/load_test.py",
+    })
+    return "POST /api/contact/messages", response
+
+
+async def admin_paging(client):
+    params = {"limit": 20}
+    if client.cursor:
+        params["cursor"] = client.cursor
+    response = await client.http.get("/api/contact/messages", params=params)
+    # Walk the inbox page by page, then start over
+    client.cursor = response.headers.get("x-next-cursor")
+    return "GET /api/contact/messages", response
+
+
+async def admin_stats(client):
+    response = await client.http.get("/api/contact/stats")
+    return "GET /api/contact/stats", response
+
+
+SCENARIOS = {
+    "homepage": [(homepage, 85), (project_list, 15)],
+    "contact-burst": [(contact_submit, 90), (homepage, 10)],
+    "admin-paging": [(admin_paging, 80), (admin_stats, 20)],
+    "mixed": [(homepage, 70), (project_list, 10), (contact_submit, 10), (admin_paging, 7), (admin_stats, 3)],
+}
+
+
+# Runner ------------------------------------------------------------------
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies):
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50), 3),
+        "p95_ms": round(percentile(values, 0.95), 3),
+        "p99_ms": round(percentile(values, 0.99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+
+async def worker(http, steps, weights, deadline, warmup_until, results):
+    client = Client(http)
+    while time.perf_counter() < deadline:
+        step = random.choices(steps, weights)[0]
+        started = time.perf_counter()
+        try:
+            name, response = await step(client)
+            status = response.status_code
+        except Exception as e:
+            name, status = step.__name__, type(e).__name__
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if started < warmup_until:
+            continue
+        results["latencies"][name].append(elapsed_ms)
+        results["status"][str(status)] += 1
+        if not isinstance(status, int) or status >= 500:
+            results["errors"] += 1
+        elif status >= 400:
+            # Rate-limited or invalid: fast, but not a success
+            results["rejected"] += 1
+
+
+async def run_load(http, scenario, concurrency, duration, warmup):
+    steps, weights = zip(*SCENARIOS[scenario])
+    results = {"latencies": defaultdict(list), "status": Counter(), "errors": 0, "rejected": 0}
+
+    started = time.perf_counter()
+    warmup_until = started + warmup
+    deadline = warmup_until + duration
+    await asyncio.gather(*(
+        worker(http, steps, weights, deadline, warmup_until, results)
+        for _ in range(concurrency)
+    ))
+    measured = time.perf_counter() - warmup_until
+
+    all_latencies = [value for values in results["latencies"].values() for value in values]
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "duration_s": round(measured, 3),
+        "requests": len(all_latencies),
+        "errors": results["errors"],
+        "rejected": results["rejected"],
+        "throughput_rps": round(len(all_latencies) / measured, 2) if measured > 0 else 0.0,
+        "latency": summarize(all_latencies),
+        "operations": {name: summarize(values) for name, values in sorted(results["latencies"].items())},
+        "status_codes": dict(results["status"]),
+    }
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    if args.target == "inprocess":
+        sys.path.insert(0, str(BACKEND_DIR))
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+        from server import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", limits=limits) as http:
+                report = await run_load(http, args.scenario, args.concurrency, args.duration, args.warmup)
+    else:
+        async with httpx.AsyncClient(base_url=args.target, limits=limits, timeout=30) as http:
+            report = await run_load(http, args.scenario, args.concurrency, args.duration, args.warmup)
+
+    report["target"] = args.target
+    report["label"] = args.label
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default=os.environ.get("LOADTEST_TARGET", "inprocess"))
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds excluded from the report")
+    parser.add_argument("--label", default=None, help="release tag stored in the report for comparisons")
+    parser.add_argument("--output", default=None, help="also write the JSON report to this file")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
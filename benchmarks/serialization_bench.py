@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Serialization Benchmark for Portfolio List Endpoints
+Compares the validated read path (Model(**doc) + response_model encoding)
+with the trusted path (field defaults + orjson) on 100-item lists
+"""
+
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from typing import List
+
+from models import Project, ContactMessage
+from serialization import dumps, trusted_list
+
+ITEMS = 100
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", "500"))
+
+
+def project_docs(count):
+    now = datetime.utcnow().replace(microsecond=0)
+    return [{
+        "_id": uuid.uuid4().hex[:24],
+        "id": str(uuid.uuid4()),
+        "title": f"Project {i}",
+        "description": "A full stack application built with modern tooling. " * 4,
+        "technologies": ["Python", "FastAPI", "React", "MongoDB"],
+        "github_url": "https://github.com/example/project",
+        "live_url": None,
+        "image_url": None,
+        "featured": i % 3 == 0,
+        "created_at": now - timedelta(minutes=i),
+    } for i in range(count)]
+
+
+def message_docs(count):
+    now = datetime.utcnow().replace(microsecond=0)
+    return [{
+        "_id": uuid.uuid4().hex[:24],
+        "id": str(uuid.uuid4()),
+        "name": f"Visitor {i}",
+        "email": f"visitor{i}@example.com",
+        "subject": "Internship opportunity",
+        "message": "Hello, I came across your portfolio and would like to talk. " * 5,
+        "created_at": now - timedelta(minutes=i),
+        "status": "new",
+    } for i in range(count)]
+
+
+def validated_path(model, docs):
+    # Previous handler: build models, then FastAPI re-validates through
+    # response_model and encodes with jsonable_encoder + json.dumps
+    items = [model(**doc) for doc in docs]
+    validated = TypeAdapter(List[model]).validate_python([item.model_dump() for item in items])
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def trusted_path(model, docs):
+    return dumps(trusted_list(model, docs))
+
+
+def measure(func, model, docs):
+    func(model, docs)  # warm up
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    for _ in range(ROUNDS):
+        func(model, docs)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return {"latency_us": round(wall / ROUNDS * 1e6, 1), "cpu_us": round(cpu / ROUNDS * 1e6, 1)}
+
+
+def main():
+    results = {}
+    for name, model, docs in [
+        ("projects", Project, project_docs(ITEMS)),
+        ("contact_messages", ContactMessage, message_docs(ITEMS)),
+    ]:
+        assert json.loads(validated_path(model, docs)) == json.loads(trusted_path(model, docs))
+        baseline = measure(validated_path, model, docs)
+        trusted = measure(trusted_path, model, docs)
+        results[name] = {
+            "items": ITEMS,
+            "rounds": ROUNDS,
+            "validated": baseline,
+            "trusted": trusted,
+            "speedup": round(baseline["latency_us"] / trusted["latency_us"], 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
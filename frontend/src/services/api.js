@@ -48,6 +48,39 @@ export const portfolioAPI = {
     }
   },
 
+  // Get only some sections, e.g. ['hero', 'about'] for the first paint
+  getPortfolioSections: async (sections) => {
+    try {
+      const response = await api.get('/portfolio', { params: { sections: sections.join(',') } });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching portfolio sections:', error);
+      throw error;
+    }
+  },
+
+  // Get a single section
+  getPortfolioSection: async (section) => {
+    try {
+      const response = await api.get(`/portfolio/sections/${section}`);
+      return response.data;
+    } catch (error) {
+      console.error(`Error fetching portfolio section ${section}:`, error);
+      throw error;
+    }
+  },
+
+  // Get entries changed or deleted since a revision (pass back `revision`)
+  getPortfolioChanges: async (since = 0) => {
+    try {
+      const response = await api.get('/portfolio/changes', { params: { since } });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching portfolio changes:', error);
+      throw error;
+    }
+  },
+
   // Update hero section
   updateHero: async (heroData) => {
     try {
@@ -0,0 +1,118 @@
+"""Cache coherence between workers, against an in-memory Mongo double"""
+
+import asyncio
+
+import pytest
+from pymongo.errors import ConnectionFailure, OperationFailure, ServerSelectionTimeoutError
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from coherence import CacheCoherence  # noqa: E402
+
+
+def make_db():
+    return mongomock_motor.AsyncMongoMockClient()["coherence_test"]
+
+
+def worker(seen):
+    coherence = CacheCoherence(mode="poll", poll_interval=0.01)
+    coherence.subscribe(["projects", "hero"], seen.append)
+    return coherence
+
+
+def test_remote_write_runs_listeners():
+    async def run():
+        db = make_db()
+        seen_a, seen_b = [], []
+        a, b = worker(seen_a), worker(seen_b)
+        await a.start(db)
+        await b.start(db)
+        try:
+            await a.publish(db, "projects")
+            await asyncio.sleep(0.1)
+        finally:
+            await a.stop()
+            await b.stop()
+        return seen_a, seen_b
+
+    seen_a, seen_b = asyncio.run(run())
+    assert seen_a == []
+    assert seen_b == ["projects"]
+
+
+def test_publish_picks_up_concurrent_remote_write():
+    async def run():
+        db = make_db()
+        seen_a, seen_b = [], []
+        a, b = worker(seen_a), worker(seen_b)
+        # Not started: only publish() can notice B's write on A
+        a._db = b._db = db
+        await b.publish(db, "projects")
+        await a.publish(db, "projects")
+        return seen_a, a.stats()["versions"]
+
+    seen_a, versions = asyncio.run(run())
+    assert seen_a == ["projects"]
+    assert versions["projects"] == 2
+
+
+def test_run_reconnects_after_errors():
+    async def run():
+        db = make_db()
+        coherence = CacheCoherence(mode="auto", poll_interval=0.01)
+        calls = []
+
+        async def flaky_watch():
+            calls.append(len(calls))
+            coherence.transport = "change_stream"
+            if len(calls) == 1:
+                raise ConnectionFailure("connection reset")
+            if len(calls) == 2:
+                raise ServerSelectionTimeoutError("no primary")
+            if len(calls) == 3:
+                return  # stream closed normally
+            await asyncio.Event().wait()
+
+        coherence._watch = flaky_watch
+        await coherence.start(db)
+        await asyncio.sleep(0.2)
+        running = not coherence._task.done()
+        await coherence.stop()
+        return calls, running
+
+    calls, running = asyncio.run(run())
+    assert len(calls) == 4
+    assert running
+
+
+def test_falls_back_to_polling_without_change_streams():
+    async def run():
+        db = make_db()
+        coherence = CacheCoherence(mode="auto", poll_interval=0.01)
+
+        async def unsupported_watch():
+            raise OperationFailure("The $changeStream stage is only supported on replica sets")
+
+        coherence._watch = unsupported_watch
+        await coherence.start(db)
+        await asyncio.sleep(0.05)
+        transport = coherence.transport
+        await coherence.stop()
+        return transport
+
+    assert asyncio.run(run()) == "poll"
+
+
+def test_stop_swallows_task_errors():
+    async def run():
+        coherence = CacheCoherence(mode="poll")
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        coherence._task = asyncio.create_task(broken())
+        await asyncio.sleep(0)
+        await coherence.stop()
+        return coherence._task
+
+    assert asyncio.run(run()) is None
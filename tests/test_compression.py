@@ -0,0 +1,57 @@
+"""Compressed responses: a 304 names the same representation as its 200"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+
+httpx = pytest.importorskip("httpx")
+
+from compression import CompressedBodyCache, CompressionMiddleware  # noqa: E402
+from http_cache import JSONPayload, cached_json_response  # noqa: E402
+
+SMALL = {"status": "ok"}
+LARGE = {"projects": [{"title": f"Project {index}", "description": "A portfolio project " * 4}
+                      for index in range(50)]}
+
+
+def make_app(body: dict, minimum_size: int = 1024):
+    app = FastAPI()
+    payload = JSONPayload.from_body(json.dumps(body).encode())
+
+    @app.get("/data")
+    async def data(request: Request):
+        return cached_json_response(request, payload)
+
+    cache = CompressedBodyCache(max_entries=16, max_bytes=1024 * 1024)
+    return CompressionMiddleware(app, cache=cache, minimum_size=minimum_size, enabled=True)
+
+
+async def fetch_twice(app):
+    """GET /data, then revalidate with the ETag the 200 carried"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        headers = {"Accept-Encoding": "gzip"}
+        first = await client.get("/data", headers=headers)
+        second = await client.get("/data", headers={**headers, "If-None-Match": first.headers["etag"]})
+    return first, second
+
+
+@pytest.mark.parametrize("body, minimum_size, encoded", [
+    # Below the size threshold: sent as is
+    (SMALL, 1024, False),
+    # gzip framing makes a tiny body bigger: sent as is
+    (SMALL, 0, False),
+    # Compressed: the 200 carries the gzip variant ETag
+    (LARGE, 1024, True),
+])
+def test_not_modified_repeats_the_200_etag(body, minimum_size, encoded):
+    first, second = asyncio.run(fetch_twice(make_app(body, minimum_size)))
+
+    assert first.status_code == 200
+    assert (first.headers.get("content-encoding") == "gzip") is encoded
+    assert first.headers["etag"].endswith('-gzip"') is encoded
+    assert second.status_code == 304
+    assert second.headers["etag"] == first.headers["etag"]
+    assert "Accept-Encoding" in second.headers["vary"]
@@ -0,0 +1,130 @@
+"""Contact message jobs: SMTP delivery, partial batches, buffered submits"""
+
+import asyncio
+import socket
+from datetime import datetime
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+import contact_jobs  # noqa: E402
+from contact_buffer import ContactWriteBuffer  # noqa: E402
+from jobs import job_queue  # noqa: E402
+
+
+def make_db():
+    return mongomock_motor.AsyncMongoMockClient()["contact_jobs_test"]
+
+
+def message(index, text="Hi, would you be open to a chat about an internship?"):
+    return {
+        "id": f"m{index}",
+        "name": f"Sender {index}",
+        "email": f"sender{index}@example.com",
+        "subject": f"Hello {index}",
+        "message": text,
+        "status": "new",
+        "created_at": datetime.utcnow(),
+    }
+
+
+def payload(doc):
+    return {field: doc[field] for field in contact_jobs.NOTIFICATION_FIELDS}
+
+
+async def run_due(db, job_type):
+    """Claim every due job of ``job_type`` and run them as one batch"""
+    job_queue._db = db
+    batch = []
+    while True:
+        job = await job_queue._claim("test", job_type)
+        if job is None:
+            break
+        batch.append(job)
+    if batch:
+        await job_queue._run(batch, job_queue._types[job_type])
+    return batch
+
+
+async def jobs_by_status(db, job_type):
+    statuses = {}
+    async for job in db.jobs.find({"type": job_type}):
+        statuses.setdefault(job["status"], []).append(job["payload"]["id"])
+    return statuses
+
+
+def test_notify_sends_through_local_smtp_server(monkeypatch):
+    aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+    from aiosmtpd.handlers import Message
+
+    received = []
+
+    class Collect(Message):
+        def handle_message(self, msg):
+            received.append(msg)
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    controller = aiosmtpd_controller.Controller(Collect(), hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        monkeypatch.setattr(contact_jobs, "NOTIFY_SMTP_HOST", "127.0.0.1")
+        monkeypatch.setattr(contact_jobs, "NOTIFY_SMTP_PORT", port)
+        monkeypatch.setattr(contact_jobs, "NOTIFY_TO", ["owner@example.com"])
+        asyncio.run(contact_jobs.notify(None, [payload(message(0)), payload(message(1))]))
+    finally:
+        controller.stop()
+
+    assert sorted(msg["Subject"] for msg in received) == ["[Portfolio] Hello 0", "[Portfolio] Hello 1"]
+    assert received[0]["To"] == "owner@example.com"
+    assert received[0]["Reply-To"].startswith("sender")
+
+
+def test_missing_message_does_not_fail_the_batch():
+    async def run():
+        db = make_db()
+        await db.contact_messages.insert_many([message(0), message(1)])
+        await job_queue.enqueue(db, [("contact.spam_check", payload(message(index))) for index in range(3)])
+
+        await run_due(db, "contact.spam_check")
+        after_first = await jobs_by_status(db, "contact.spam_check")
+        notify = await jobs_by_status(db, "contact.notify")
+
+        # Retry the missing one until its cap, skipping the backoff
+        for _ in range(contact_jobs.MISSING_MESSAGE_ATTEMPTS):
+            await db.jobs.update_many({"status": "queued"}, {"$set": {"run_at": datetime.utcnow()}})
+            await run_due(db, "contact.spam_check")
+        scored = await db.contact_messages.count_documents({"spam_score": {"$exists": True}})
+        return after_first, notify, await jobs_by_status(db, "contact.spam_check"), scored
+
+    after_first, notify, final, scored = asyncio.run(run())
+    assert sorted(after_first["done"]) == ["m0", "m1"]
+    assert after_first["queued"] == ["m2"]
+    assert sorted(notify["queued"]) == ["m0", "m1"]
+    assert final["failed"] == ["m2"]
+    assert scored == 2
+
+
+def test_buffered_submits_queue_jobs_per_flush(monkeypatch):
+    inserts = []
+    original = job_queue.enqueue
+
+    async def counting_enqueue(db, jobs):
+        inserts.append(len(jobs))
+        return await original(db, jobs)
+
+    monkeypatch.setattr(job_queue, "enqueue", counting_enqueue)
+
+    async def run():
+        db = make_db()
+        buffer = ContactWriteBuffer(enabled=True, durability="flush", max_batch=10, max_delay=0.05)
+        buffer.start(db)
+        await asyncio.gather(*(buffer.submit(message(index)) for index in range(4)))
+        await buffer.stop()
+        return await db.jobs.count_documents({})
+
+    total = asyncio.run(run())
+    assert inserts == [8]
+    assert total == 8
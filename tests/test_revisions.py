@@ -0,0 +1,83 @@
+"""Delta sync: changes are only handed out once every earlier write is done"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+import revisions  # noqa: E402
+
+
+def make_db():
+    return mongomock_motor.AsyncMongoMockClient()["revisions_test"]
+
+
+async def write_project(db, project_id, revision):
+    await db.projects.insert_one({"id": project_id, "revision": revision, "updated_at": datetime.utcnow()})
+
+
+def test_slow_write_holds_back_later_revisions():
+    async def run():
+        db = make_db()
+        slow = revisions.reserve_revisions(db, 3)
+        first = await slow.__aenter__()
+
+        # A faster writer reserves after the slow one and commits first
+        async with revisions.reserve_revisions(db) as revision:
+            await write_project(db, "fast", revision)
+        while_pending = await revisions.changes_since(db, 0)
+
+        for offset in range(3):
+            await write_project(db, f"slow-{offset}", first + offset)
+        await slow.__aexit__(None, None, None)
+        after = await revisions.changes_since(db, while_pending["revision"])
+        return first, revision, while_pending, after
+
+    first, fast_revision, while_pending, after = asyncio.run(run())
+    assert (first, fast_revision) == (1, 4)
+    assert while_pending == {"since": 0, "revision": 0, "has_more": False, "changes": []}
+    assert [change["id"] for change in after["changes"]] == ["slow-0", "slow-1", "slow-2", "fast"]
+    assert after["revision"] == 4
+    assert after["has_more"] is False
+
+
+def test_limit_sets_has_more():
+    async def run():
+        db = make_db()
+        async with revisions.reserve_revisions(db, 3) as first:
+            for offset in range(3):
+                await write_project(db, f"p{offset}", first + offset)
+        return await revisions.changes_since(db, 0, limit=2)
+
+    page = asyncio.run(run())
+    assert [change["revision"] for change in page["changes"]] == [1, 2]
+    assert page["has_more"] is True
+    assert page["revision"] == 2
+
+
+def test_abandoned_reservation_expires():
+    async def run():
+        db = make_db()
+        await db.portfolio_revision.insert_one({
+            "_id": revisions.REVISION_ID,
+            "value": 1,
+            "pending": [{"first": 1, "expires_at": datetime.utcnow() - timedelta(seconds=1)}],
+        })
+        async with revisions.reserve_revisions(db) as revision:
+            await write_project(db, "after-crash", revision)
+        return await revisions.changes_since(db, 0), await db.portfolio_revision.find_one()
+
+    changes, counter = asyncio.run(run())
+    assert [change["id"] for change in changes["changes"]] == ["after-crash"]
+    assert counter["pending"] == []
+
+
+def test_concurrent_reservations_do_not_overlap():
+    async def run():
+        db = make_db()
+        return await asyncio.gather(*(revisions._reserve(db, 2) for _ in range(10)))
+
+    firsts = sorted(asyncio.run(run()))
+    assert firsts == list(range(1, 21, 2))